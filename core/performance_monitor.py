@@ -5,16 +5,25 @@ Monitors system resources during Docker tests with detailed analysis
 """
 
 import psutil
+import numpy as np
 import time
+import collections
 import json
 import threading
 import subprocess
 import os
+import sys
+import glob
 from typing import Dict, List, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 import argparse
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
+@dataclass(slots=True)
 class SystemMetrics:
     """System performance metrics"""
     timestamp: float
@@ -28,16 +37,75 @@ class SystemMetrics:
     docker_containers: int
     docker_cpu_percent: float
     docker_memory_mb: float
+    
+    FIELDS = ('timestamp', 'cpu_percent', 'memory_percent', 'memory_available',
+              'disk_io_read', 'disk_io_write', 'network_sent', 'network_recv',
+              'docker_containers', 'docker_cpu_percent', 'docker_memory_mb')
+    
+    def to_tuple(self) -> tuple:
+        """Return field values in FIELDS order"""
+        return (self.timestamp, self.cpu_percent, self.memory_percent, self.memory_available,
+                self.disk_io_read, self.disk_io_write, self.network_sent, self.network_recv,
+                self.docker_containers, self.docker_cpu_percent, self.docker_memory_mb)
 
-@dataclass
-class ProcessMetrics:
-    """Process-specific metrics"""
-    pid: int
-    name: str
-    cpu_percent: float
-    memory_mb: float
-    threads: int
-    connections: int
+class ProcessHistory:
+    """Process-specific metrics stored column-wise (SoA) in fixed-size NumPy ring buffers"""
+    
+    FIELDS = ('pid', 'name', 'cpu_percent', 'memory_mb', 'threads', 'connections')
+    
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.size = 0
+        self._next = 0  # Slot the next sample overwrites once the ring is full
+        self.pid = np.zeros(capacity, dtype=np.int64)
+        self.cpu_percent = np.zeros(capacity, dtype=np.float64)
+        self.memory_mb = np.zeros(capacity, dtype=np.float64)
+        self.threads = np.zeros(capacity, dtype=np.int32)
+        self.connections = np.zeros(capacity, dtype=np.int32)
+        self.name: List[str] = [''] * capacity
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def append(self, pid: int, name: str, cpu_percent: float, memory_mb: float,
+               threads: int, connections: int):
+        """Store one sample as a row across the column arrays, replacing the oldest when full"""
+        i = self._next
+        self.pid[i] = pid
+        self.cpu_percent[i] = cpu_percent
+        self.memory_mb[i] = memory_mb
+        self.threads[i] = threads
+        self.connections[i] = connections
+        self.name[i] = name
+        self._next = (i + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Convert stored samples to JSON-ready row dicts, oldest first"""
+        start = (self._next - self.size) % self.capacity
+        order = (np.arange(self.size) + start) % self.capacity
+        columns = (
+            self.pid[order].tolist(),
+            [self.name[i] for i in order.tolist()],
+            self.cpu_percent[order].tolist(),
+            self.memory_mb[order].tolist(),
+            self.threads[order].tolist(),
+            self.connections[order].tolist()
+        )
+        return [dict(zip(self.FIELDS, row)) for row in zip(*columns)]
+
+# cgroup directories created per container by Docker with the systemd and cgroupfs drivers
+CGROUP_ROOT = '/sys/fs/cgroup'
+DOCKER_CGROUP_V2_PATTERNS = ('system.slice/docker-*.scope', 'docker/*')
+# v1 paths are relative to the cpuacct hierarchy; the memory hierarchy mirrors them
+DOCKER_CGROUP_V1_PATTERNS = ('docker/*', 'system.slice/docker-*.scope')
+CGROUP_REFRESH_TICKS = 10  # Rescan container cgroups every N samples
+PROC_RECHECK_TICKS = 10  # Re-examine pids rejected as non-Python every N samples
+
+# Bounded in-memory history: keep the most recent window of samples only
+HISTORY_WINDOW = 3600  # Samples (one hour at the default 1s interval)
+MAX_TRACKED_PROCS = 64  # Python processes expected per sample
 
 class EnhancedPerformanceMonitor:
     """Enhanced system performance monitor"""
@@ -45,10 +113,25 @@ class EnhancedPerformanceMonitor:
     def __init__(self, output_file: str = "enhanced_metrics.json"):
         self.output_file = output_file
         self.monitoring = False
-        self.metrics_history: List[SystemMetrics] = []
-        self.process_history: List[ProcessMetrics] = []
+        self.metrics_history = collections.deque(maxlen=HISTORY_WINDOW)
+        self.process_history = ProcessHistory(MAX_TRACKED_PROCS * HISTORY_WINDOW)
         self.monitor_thread = None
         
+        # Long-lived handles for Python processes, refreshed from pid-set deltas
+        self._known_procs: Dict[int, tuple] = {}
+        self._seen_pids: set = set()
+        self._proc_ticks = 0
+        
+        # Docker metrics are read from cgroup files when the host exposes them;
+        # otherwise (e.g. Docker Desktop) fall back to the docker CLI
+        self._use_cgroups = os.path.isdir(CGROUP_ROOT)
+        self._docker_cgroups: Dict[str, tuple] = {}
+        self._cgroup_ticks = 0
+        self._prev_cpu: Dict[str, tuple] = {}
+        
+        # Prime the system CPU counter so later non-blocking calls measure since the previous tick
+        psutil.cpu_percent(interval=None)
+        
     def start_monitoring(self, interval: float = 1.0):
         """Start monitoring system resources"""
         if self.monitoring:
@@ -75,16 +158,12 @@ class EnhancedPerformanceMonitor:
         """Main monitoring loop"""
         while self.monitoring:
             try:
-                # Collect system metrics
-                system_metrics = self._collect_system_metrics()
+                # Collect system, process and Docker metrics together
+                system_metrics, process_count = self._collect_all()
                 self.metrics_history.append(system_metrics)
                 
-                # Collect process metrics
-                process_metrics = self._collect_process_metrics()
-                self.process_history.extend(process_metrics)
-                
                 # Print real-time status
-                self._print_status(system_metrics, process_metrics)
+                self._print_status(system_metrics, process_count)
                 
                 time.sleep(interval)
                 
@@ -92,23 +171,67 @@ class EnhancedPerformanceMonitor:
                 print(f"Monitoring error: {e}")
                 time.sleep(interval)
     
-    def _collect_system_metrics(self) -> SystemMetrics:
-        """Collect system-wide metrics"""
-        # CPU and Memory
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        memory = psutil.virtual_memory()
+    def _refresh_known_procs(self):
+        """Track Python processes by applying pid-set deltas instead of full rescans"""
+        current = set(psutil.pids())
         
-        # Disk I/O
-        disk_io = psutil.disk_io_counters()
+        # Forget rejected pids now and then: a fork may exec into Python after it was
+        # first seen, and access errors may be transient
+        if self._proc_ticks % PROC_RECHECK_TICKS == 0:
+            self._seen_pids = set(self._known_procs)
+        self._proc_ticks += 1
+        
+        for pid in self._seen_pids - current:
+            self._known_procs.pop(pid, None)
+        
+        for pid in current - self._seen_pids:
+            try:
+                proc = psutil.Process(pid)
+                name = proc.name()
+                if name and 'python' in name.lower():
+                    proc.cpu_percent()  # Prime so the next sample covers a full tick
+                    self._known_procs[pid] = (proc, name)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
         
-        # Network I/O
+        self._seen_pids = current
+    
+    def _collect_all(self) -> tuple:
+        """Collect system, Python process and Docker metrics in one pass per tick"""
+        timestamp = time.time()
+        
+        # One read each of the system-wide counters
+        cpu_percent = psutil.cpu_percent(interval=None)
+        memory = psutil.virtual_memory()
+        disk_io = psutil.disk_io_counters()
         network_io = psutil.net_io_counters()
         
-        # Docker metrics
+        # Single pass over the cached Python process handles
+        self._refresh_known_procs()
+        history = self.process_history
+        process_count = 0
+        
+        for pid, (proc, name) in list(self._known_procs.items()):
+            try:
+                with proc.oneshot():
+                    history.append(
+                        pid, name,
+                        proc.cpu_percent(),
+                        proc.memory_info().rss / 1024 / 1024,
+                        proc.num_threads(),
+                        len(proc.connections()) if hasattr(proc, 'connections') else 0
+                    )
+                    process_count += 1
+            except psutil.NoSuchProcess:
+                del self._known_procs[pid]
+            except psutil.AccessDenied:
+                continue
+        
+        # Docker metrics (cgroup files when available)
         docker_containers, docker_cpu, docker_memory = self._get_docker_metrics()
         
-        return SystemMetrics(
-            timestamp=time.time(),
+        system_metrics = SystemMetrics(
+            timestamp=timestamp,
             cpu_percent=cpu_percent,
             memory_percent=memory.percent,
             memory_available=memory.available,
@@ -120,40 +243,81 @@ class EnhancedPerformanceMonitor:
             docker_cpu_percent=docker_cpu,
             docker_memory_mb=docker_memory
         )
+        return system_metrics, process_count
+    
+    def _get_docker_metrics(self) -> tuple:
+        """Get Docker container metrics"""
+        if self._use_cgroups:
+            metrics = self._get_docker_metrics_cgroup()
+            # No container cgroups in a known layout; the CLI still sees the containers
+            if self._docker_cgroups:
+                return metrics
+        return self._get_docker_metrics_cli()
     
-    def _collect_process_metrics(self) -> List[ProcessMetrics]:
-        """Collect process-specific metrics"""
-        metrics = []
+    def _discover_docker_cgroups(self) -> Dict[str, tuple]:
+        """Map each container cgroup to its (cpu file, memory file, cgroup version)"""
+        cgroups = {}
         
-        # Monitor Python processes
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_info', 'num_threads']):
+        for pattern in DOCKER_CGROUP_V2_PATTERNS:
+            for path in glob.glob(os.path.join(CGROUP_ROOT, pattern)):
+                cpu_file = os.path.join(path, 'cpu.stat')
+                if os.path.isfile(cpu_file):
+                    cgroups[path] = (cpu_file, os.path.join(path, 'memory.current'), 2)
+        
+        cpuacct_root = os.path.join(CGROUP_ROOT, 'cpuacct')
+        for pattern in DOCKER_CGROUP_V1_PATTERNS:
+            for path in glob.glob(os.path.join(cpuacct_root, pattern)):
+                cpu_file = os.path.join(path, 'cpuacct.usage')
+                if os.path.isfile(cpu_file):
+                    mem_file = os.path.join(CGROUP_ROOT, 'memory', os.path.relpath(path, cpuacct_root),
+                                            'memory.usage_in_bytes')
+                    cgroups[path] = (cpu_file, mem_file, 1)
+        
+        return cgroups
+    
+    @staticmethod
+    def _read_cgroup_cpu_ns(cpu_file: str, version: int) -> int:
+        """Read cumulative container CPU time in nanoseconds"""
+        with open(cpu_file) as f:
+            if version == 1:
+                return int(f.read())
+            for line in f:
+                if line.startswith('usage_usec'):
+                    return int(line.split()[1]) * 1000
+        return 0
+    
+    def _get_docker_metrics_cgroup(self) -> tuple:
+        """Get Docker container metrics from cgroup accounting files"""
+        if self._cgroup_ticks % CGROUP_REFRESH_TICKS == 0:
+            self._docker_cgroups = self._discover_docker_cgroups()
+            self._prev_cpu = {path: prev for path, prev in self._prev_cpu.items()
+                              if path in self._docker_cgroups}
+        self._cgroup_ticks += 1
+        
+        cpu_total = 0.0
+        memory_total = 0.0
+        now_ns = time.monotonic_ns()
+        
+        for path, (cpu_file, mem_file, version) in self._docker_cgroups.items():
             try:
-                if proc.info['name'] and 'python' in proc.info['name'].lower():
-                    # Get process details
-                    with proc.oneshot():
-                        cpu_percent = proc.cpu_percent()
-                        memory_info = proc.memory_info()
-                        memory_mb = memory_info.rss / 1024 / 1024
-                        threads = proc.num_threads()
-                        
-                        # Count network connections
-                        connections = len(proc.connections()) if hasattr(proc, 'connections') else 0
-                        
-                        metrics.append(ProcessMetrics(
-                            pid=proc.pid,
-                            name=proc.name(),
-                            cpu_percent=cpu_percent,
-                            memory_mb=memory_mb,
-                            threads=threads,
-                            connections=connections
-                        ))
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                cpu_ns = self._read_cgroup_cpu_ns(cpu_file, version)
+                
+                # CPU% as in `docker stats`: CPU time delta over wall time delta
+                prev = self._prev_cpu.get(path)
+                if prev and now_ns > prev[1]:
+                    cpu_total += (cpu_ns - prev[0]) / (now_ns - prev[1]) * 100
+                self._prev_cpu[path] = (cpu_ns, now_ns)
+                
+                with open(mem_file) as f:
+                    memory_total += int(f.read()) / 1024 / 1024
+            except (OSError, ValueError):
+                # Container exited between discovery and read
                 continue
         
-        return metrics
+        return len(self._docker_cgroups), cpu_total, memory_total
     
-    def _get_docker_metrics(self) -> tuple:
-        """Get Docker container metrics"""
+    def _get_docker_metrics_cli(self) -> tuple:
+        """Get Docker container metrics via the docker CLI"""
         try:
             # Count running containers
             result = subprocess.run(
@@ -188,7 +352,7 @@ class EnhancedPerformanceMonitor:
                                     memory_total += float(mem_str.replace('MiB', ''))
                                 elif 'GiB' in mem_str:
                                     memory_total += float(mem_str.replace('GiB', '')) * 1024
-                            except:
+                            except ValueError:
                                 pass
                 
                 return container_count, cpu_total, memory_total
@@ -199,23 +363,33 @@ class EnhancedPerformanceMonitor:
             print(f"Docker metrics error: {e}")
             return 0, 0.0, 0.0
     
-    def _print_status(self, system_metrics: SystemMetrics, process_metrics: List[ProcessMetrics]):
+    def _print_status(self, system_metrics: SystemMetrics, process_count: int):
         """Print real-time status"""
-        print(f"\r[Monitor] CPU: {system_metrics.cpu_percent:.1f}% | "
-              f"RAM: {system_metrics.memory_percent:.1f}% | "
-              f"Docker: {system_metrics.docker_containers} containers | "
-              f"Python procs: {len(process_metrics)}", end='', flush=True)
+        # Cosmetic one-line status; write directly rather than through print/logging
+        sys.stdout.write(f"\r[Monitor] CPU: {system_metrics.cpu_percent:.1f}% | "
+                         f"RAM: {system_metrics.memory_percent:.1f}% | "
+                         f"Docker: {system_metrics.docker_containers} containers | "
+                         f"Python procs: {process_count}")
+        sys.stdout.flush()
     
     def _save_results(self):
         """Save monitoring results to file"""
         results = {
-            'system_metrics': [asdict(m) for m in self.metrics_history],
-            'process_metrics': [asdict(p) for p in self.process_history],
+            # Rows are tuples in SystemMetrics.FIELDS order
+            'system_metrics': {
+                'fields': SystemMetrics.FIELDS,
+                'rows': [m.to_tuple() for m in self.metrics_history]
+            },
+            'process_metrics': self.process_history.to_records(),
             'summary': self._generate_summary()
         }
         
-        with open(self.output_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        if orjson is not None:
+            with open(self.output_file, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(self.output_file, 'w') as f:
+                json.dump(results, f, indent=2)
         
         print(f"\nEnhanced metrics saved to {self.output_file}")
     
@@ -228,8 +402,9 @@ class EnhancedPerformanceMonitor:
         cpu_values = [m.cpu_percent for m in self.metrics_history]
         memory_values = [m.memory_percent for m in self.metrics_history]
         
-        # Process summary
-        python_processes = [p for p in self.process_history if 'python' in p.name.lower()]
+        # Process summary (history only holds Python processes)
+        history = self.process_history
+        n = history.size
         
         return {
             'monitoring_duration': len(self.metrics_history),
@@ -237,9 +412,9 @@ class EnhancedPerformanceMonitor:
             'max_cpu_percent': max(cpu_values),
             'avg_memory_percent': sum(memory_values) / len(memory_values),
             'max_memory_percent': max(memory_values),
-            'total_python_processes': len(python_processes),
-            'avg_python_cpu': sum(p.cpu_percent for p in python_processes) / len(python_processes) if python_processes else 0,
-            'avg_python_memory': sum(p.memory_mb for p in python_processes) / len(python_processes) if python_processes else 0
+            'total_python_processes': n,
+            'avg_python_cpu': float(np.mean(history.cpu_percent[:n])) if n else 0,
+            'avg_python_memory': float(np.mean(history.memory_mb[:n])) if n else 0
         }
 
 def main():
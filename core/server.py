@@ -6,17 +6,17 @@ Handles up to 10 client connections with 32-byte packets at 10kHz
 
 import socket
 import multiprocessing as mp
-import threading
 import time
 import json
 import logging
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
-from queue import Queue, Empty
+from typing import List
 import signal
 import sys
 import os
-import psutil
+import selectors
+import functools
+from multiprocessing import shared_memory
+import numpy as np
 
 # Configure logging
 logging.basicConfig(
@@ -25,133 +25,340 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@dataclass
-class ClientStats:
-    """Statistics for a client connection"""
-    client_id: str
-    packets_received: int = 0
-    bytes_received: int = 0
-    start_time: float = 0
-    last_packet_time: float = 0
-    avg_packet_rate: float = 0
-    
-    def update_rate(self):
-        """Calculate average packet rate"""
-        if self.start_time > 0:
-            elapsed = time.time() - self.start_time
-            if elapsed > 0:
-                self.avg_packet_rate = self.packets_received / elapsed
+STATS_LOG_INTERVAL = 1.0  # Seconds between aggregate stats log lines
+WORKER_LOG_LEVEL = logging.WARNING  # Data-plane processes only log problems
+ERROR_LOG_INTERVAL = 1.0  # Minimum seconds between worker error log lines
+STATS_LOG_FORMAT = "Total: %d packets, %d bytes, Rate: %.1f packets/sec"
+
+# Column layout of the per-worker client stats table (one row per client slot).
+# Packet and byte counts carry over when a slot is reused, so they only ever grow
+# and the parent sums the columns directly instead of tracking per-client deltas.
+STAT_PACKETS, STAT_BYTES = range(2)
+STATS_COLUMNS = 2
+STATS_ROW_BYTES = STATS_COLUMNS * 8  # uint64 columns
+
+# Fork so workers inherit shared mappings without re-importing the module. The server
+# is POSIX-only: it also needs AF_UNIX socketpairs, fd passing and CPU affinity.
+MP_CONTEXT = mp.get_context('fork')
+
+PACKET_SIZE = 32  # Bytes per client packet
+RECV_BUFFER_SIZE = 4096  # One recv drains up to 128 packets
+STATS_REPORT_PACKETS = 100  # Publish client stats every N packets
+MAX_RECVS_PER_EVENT = 16  # recv calls per readiness event before yielding to other clients
+
+# Linux-only receive tuning: TCP_QUICKACK suppresses delayed ACKs (the kernel clears
+# it again, so it is re-armed on each stats report) and SO_RCVLOWAT makes a socket
+# readable only once a whole packet is queued. SO_RCVLOWAT behaves differently
+# elsewhere (e.g. macOS), so both are skipped off Linux.
+TCP_QUICKACK = getattr(socket, 'TCP_QUICKACK', None) if sys.platform.startswith('linux') else None
+SO_RCVLOWAT = getattr(socket, 'SO_RCVLOWAT', None) if sys.platform.startswith('linux') else None
+
+class ClientConnection:
+    """Per-connection receive state kept alongside its selector registration"""
+    
+    __slots__ = ('sock', 'client_id', 'slot', 'row', 'mv', 'leftover', 'next_report',
+                 'packets', 'nbytes')
+    
+    def __init__(self, sock: socket.socket, client_id: str, slot: int, row: np.ndarray):
+        self.sock = sock
+        self.client_id = client_id
+        self.slot = slot
+        self.row = row
+        # Receive batches into one preallocated buffer; no per-packet bytes objects
+        self.mv = memoryview(bytearray(RECV_BUFFER_SIZE))
+        self.leftover = 0  # Bytes of a partial packet kept at the start of the buffer
+        # Running slot totals as plain ints, continuing from the row; written back when reported
+        self.packets = int(row[STAT_PACKETS])
+        self.nbytes = int(row[STAT_BYTES])
+        self.next_report = self.packets + STATS_REPORT_PACKETS
 
 class WorkerProcess:
-    """Worker process to handle client connections"""
+    """Worker process multiplexing its client connections on one selector"""
     
-    def __init__(self, worker_id: int, stats_queue: mp.Queue):
+    def __init__(self, worker_id: int, stats: np.ndarray):
         self.worker_id = worker_id
-        self.stats_queue = stats_queue
-        self.clients: Dict[str, ClientStats] = {}
+        self.selector = selectors.DefaultSelector()  # epoll on Linux
+        
+        # Struct-of-arrays client stats indexed by a small integer slot; a view of
+        # this worker's block of the parent-allocated shared table
+        self.stats = stats
+        self.free_mask = (1 << len(stats)) - 1  # Bit i set = slot i free
+        self.clients: List[ClientConnection] = [None] * len(stats)  # Indexed by slot
         self.running = True
         
-    def handle_client(self, client_socket: socket.socket, client_address: Tuple[str, int]):
-        """Handle a single client connection"""
-        client_id = f"{client_address[0]}:{client_address[1]}"
-        logger.info(f"Worker {self.worker_id} handling client {client_id}")
+        # Error log rate limiting
+        self._last_error_log = 0.0
+        self._suppressed_errors = 0
+    
+    def _log_error(self, msg: str, *args):
+        """Log an error at most once per ERROR_LOG_INTERVAL, counting the rest"""
+        now = time.monotonic()
+        if now - self._last_error_log < ERROR_LOG_INTERVAL:
+            self._suppressed_errors += 1
+            return
+        if self._suppressed_errors:
+            msg += " (%d similar errors suppressed)"
+            args += (self._suppressed_errors,)
+        logger.error(msg, *args)
+        self._last_error_log = now
+        self._suppressed_errors = 0
+    
+    def run(self, listener, control: socket.socket):
+        """Serve connections until the parent sends a shutdown message on the control socket"""
+        if listener is not None:
+            listener.setblocking(False)
+            self.selector.register(listener, selectors.EVENT_READ, self._accept)
+        control.setblocking(False)
+        self.selector.register(control, selectors.EVENT_READ, self._on_control)
         
-        # Initialize client stats
-        client_stats = ClientStats(
-            client_id=client_id,
-            start_time=time.time()
-        )
-        self.clients[client_id] = client_stats
+        while self.running:
+            for key, _ in self.selector.select(timeout=0.5):
+                # One failing socket must not take down the worker and all its other clients
+                try:
+                    key.data(key.fileobj)
+                except OSError as e:
+                    self._on_socket_error(key.fileobj, e)
+        
+        for conn in self.clients:
+            if conn is not None:
+                self._close_client(conn)
+        self.selector.close()
+    
+    def _on_socket_error(self, sock: socket.socket, e: OSError):
+        """Close the client whose callback failed; listener and control errors are only logged"""
+        self._log_error("Worker %d socket error: %s", self.worker_id, e)
+        for conn in self.clients:
+            if conn is not None and conn.sock is sock:
+                self._close_client(conn)
+                break
+    
+    def _on_control(self, control: socket.socket):
+        """Adopt a client passed by the parent acceptor, or stop on a bare message"""
+        _, fds, _, _ = socket.recv_fds(control, 16, 1)
+        if not fds:
+            self.running = False
+            return
         
+        client_socket = socket.socket(fileno=fds[0])
         try:
-            while self.running:
-                # Receive 32-byte packet
-                data = client_socket.recv(32)
-                if not data:
-                    break
-                    
-                # Update statistics
-                client_stats.packets_received += 1
-                client_stats.bytes_received += len(data)
-                client_stats.last_packet_time = time.time()
-                client_stats.update_rate()
-                
-                # Send stats to main process periodically
-                if client_stats.packets_received % 100 == 0:
-                    self.stats_queue.put({
-                        'worker_id': self.worker_id,
-                        'client_id': client_id,
-                        'stats': {
-                            'packets_received': client_stats.packets_received,
-                            'bytes_received': client_stats.bytes_received,
-                            'avg_packet_rate': client_stats.avg_packet_rate
-                        }
-                    })
-                
-                # Simulate some processing (optional)
-                # time.sleep(0.0001)  # 0.1ms processing time
-                
-        except Exception as e:
-            logger.error(f"Error handling client {client_id}: {e}")
-        finally:
-            client_socket.close()
-            logger.info(f"Client {client_id} disconnected from worker {self.worker_id}")
-            if client_id in self.clients:
-                del self.clients[client_id]
-
-def worker_process(worker_id: int, connection_queue: mp.Queue, stats_queue: mp.Queue):
-    """Worker process function"""
-    # Set worker process priority for better performance
-    try:
-        current_process = psutil.Process()
-        current_process.nice(psutil.HIGH_PRIORITY_CLASS)
-        print(f"Worker {worker_id}: Set high process priority")
-    except Exception as e:
-        print(f"Worker {worker_id}: Could not set process priority: {e}")
+            client_address = client_socket.getpeername()
+        except OSError:
+            client_socket.close()  # Client went away while being dispatched
+            return
+        self._add_client(client_socket, client_address)
     
-    logger.info(f"Worker process {worker_id} started")
-    worker = WorkerProcess(worker_id, stats_queue)
+    def _accept(self, listener: socket.socket):
+        """Accept a new client from this worker's own listener"""
+        try:
+            client_socket, client_address = listener.accept()
+        except BlockingIOError:
+            return  # Another worker took it
+        self._add_client(client_socket, client_address)
     
-    while True:
+    def _add_client(self, client_socket: socket.socket, client_address):
+        """Assign a stats slot to a new client and register it with the selector"""
+        client_id = f"{client_address[0]}:{client_address[1]}"
+        if not self.free_mask:
+            logger.warning(f"Worker {self.worker_id} has no free slot for client {client_id}")
+            client_socket.close()
+            return
+        logger.debug("Worker %d handling client %s", self.worker_id, client_id)
+        
+        # Optimize client socket (Nagle left on: the server only receives)
         try:
-            # Get connection from queue
-            connection_data = connection_queue.get(timeout=1.0)
-            if connection_data is None:  # Shutdown signal
+            client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 131072)
+            client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 131072)
+            if TCP_QUICKACK is not None:
+                client_socket.setsockopt(socket.IPPROTO_TCP, TCP_QUICKACK, 1)
+            if SO_RCVLOWAT is not None:
+                client_socket.setsockopt(socket.SOL_SOCKET, SO_RCVLOWAT, PACKET_SIZE)
+            client_socket.setblocking(False)
+        except OSError as e:
+            # Client reset while being accepted; no slot has been taken yet
+            self._log_error("Could not set up client %s: %s", client_id, e)
+            client_socket.close()
+            return
+        
+        # Take the lowest free stats slot once per connection; its counts carry over
+        free_mask = self.free_mask
+        slot = (free_mask & -free_mask).bit_length() - 1  # Lowest free slot
+        self.free_mask = free_mask & (free_mask - 1)
+        conn = ClientConnection(client_socket, client_id, slot, self.stats[slot])
+        self.clients[slot] = conn
+        self.selector.register(client_socket, selectors.EVENT_READ,
+                               functools.partial(self._on_readable, conn))
+    
+    def _on_readable(self, conn: ClientConnection, client_socket: socket.socket):
+        """Drain queued packets from a readable client socket"""
+        leftover = conn.leftover
+        mv = conn.mv
+        recv_into = client_socket.recv_into
+        received = 0
+        closed = False
+        
+        # Read until the socket is drained (bounded for fairness between clients),
+        # tallying packets locally and touching the stats row once per event
+        for _ in range(MAX_RECVS_PER_EVENT):
+            try:
+                # Receive as many packets as are queued, after any partial one
+                space = RECV_BUFFER_SIZE - leftover
+                n = recv_into(mv[leftover:], space)
+            except BlockingIOError:
                 break
-                
-            client_socket, client_address = connection_data
-            worker.handle_client(client_socket, client_address)
+            except Exception as e:
+                self._log_error("Error handling client %s: %s", conn.client_id, e)
+                closed = True
+                break
+            if not n:
+                closed = True
+                break
+            
+            total = leftover + n
+            count = total // PACKET_SIZE
+            consumed = count * PACKET_SIZE
+            leftover = total - consumed
+            if leftover:
+                mv[:leftover] = mv[consumed:total]
+            received += count
             
-        except Empty:
-            continue
-        except Exception as e:
-            logger.error(f"Worker {worker_id} error: {e}")
+            if n < space:
+                break  # Short read: nothing more queued right now
+        
+        conn.leftover = leftover
+        
+        if received:
+            # Update statistics once per event, on locals
+            packets = conn.packets + received
+            nbytes = conn.nbytes + received * PACKET_SIZE
+            conn.packets = packets
+            conn.nbytes = nbytes
+            
+            # Publish stats to the shared row periodically
+            if packets >= conn.next_report:
+                row = conn.row
+                row[STAT_PACKETS] = packets
+                row[STAT_BYTES] = nbytes
+                conn.next_report = packets + STATS_REPORT_PACKETS
+                if TCP_QUICKACK is not None:
+                    client_socket.setsockopt(socket.IPPROTO_TCP, TCP_QUICKACK, 1)
+        
+        if closed:
+            self._close_client(conn)
+    
+    def _close_client(self, conn: ClientConnection):
+        """Unregister and close a client, publishing its final counts"""
+        self.selector.unregister(conn.sock)
+        conn.sock.close()
+        
+        # Flush the final counts to the row; the next client in this slot continues from them
+        row = conn.row
+        row[STAT_PACKETS] = conn.packets
+        row[STAT_BYTES] = conn.nbytes
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Client {conn.client_id} disconnected from worker {self.worker_id}")
+        self.clients[conn.slot] = None
+        self.free_mask |= 1 << conn.slot
+
+def _create_listener(host: str, port: int, max_clients: int, reuseport: bool = True) -> socket.socket:
+    """Create a listening socket, shared by workers on host:port via SO_REUSEPORT"""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     
+    # Enhanced socket optimizations for high-performance server
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuseport:
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)  # Kernel balances SYNs across workers
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 131072)  # 128KB receive buffer
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 131072)  # 128KB send buffer
+    
+    listener.bind((host, port))
+    listener.listen(max_clients)
+    return listener
+
+def worker_process(worker_id: int, host: str, port: int, max_clients: int,
+                   table_shm: shared_memory.SharedMemory, control: socket.socket,
+                   reuseport: bool = True):
+    """Worker process function: serves connections from its own listener or the parent"""
+    # The parent handles Ctrl+C/SIGTERM and stops workers via the control socket
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    
+    # Keep logging off the data path unless something goes wrong
+    logging.getLogger().setLevel(WORKER_LOG_LEVEL)
+    
+    # Pin each worker to one core, leaving the first core to the kernel and monitor
+    try:
+        cores = sorted(os.sched_getaffinity(0))
+        if len(cores) > 1:
+            core_id = cores[1 + worker_id % (len(cores) - 1)]
+        else:
+            core_id = cores[0]
+        os.sched_setaffinity(0, {core_id})
+        print(f"Worker {worker_id}: Pinned to CPU core {core_id}")
+    except (AttributeError, OSError) as e:
+        print(f"Worker {worker_id}: Could not set process affinity: {e}")
+    
+    # Without SO_REUSEPORT the parent accepts and passes clients over the control socket
+    listener = None
+    if reuseport:
+        try:
+            listener = _create_listener(host, port, max_clients)
+        except OSError as e:
+            logger.error(f"Worker {worker_id} could not listen on {host}:{port}: {e}")
+            return
+        logger.info(f"Worker process {worker_id} started, listening on {host}:{port}")
+    else:
+        logger.info(f"Worker process {worker_id} started, receiving clients from the acceptor")
+    
+    stats_table = np.ndarray((max_clients, STATS_COLUMNS), dtype=np.uint64, buffer=table_shm.buf,
+                             offset=worker_id * max_clients * STATS_ROW_BYTES)
+    worker = WorkerProcess(worker_id, stats_table)
+    
+    try:
+        worker.run(listener, control)
+    except Exception as e:
+        logger.error(f"Worker {worker_id} error: {e}")
+    
+    if listener is not None:
+        listener.close()
     logger.info(f"Worker process {worker_id} shutting down")
 
 class MultiprocessingServer:
-    """Main server class with multiprocessing support"""
+    """Main server class supervising SO_REUSEPORT worker processes"""
     
     def __init__(self, host: str = 'localhost', port: int = 8888, 
-                 num_workers: int = None, max_clients: int = 10):
+                 num_workers: int = None, max_clients: int = 10,
+                 reuseport: bool = True):
         self.host = host
         self.port = port
         self.max_clients = max_clients
         self.num_workers = num_workers or min(mp.cpu_count(), max_clients)
+        # Without SO_REUSEPORT (e.g. Linux before 3.9) the parent accepts and passes client
+        # fds to workers instead; that path needs AF_UNIX fd passing, so it is POSIX-only too
+        self.reuseport = reuseport and hasattr(socket, 'SO_REUSEPORT')
         
-        # Multiprocessing components
-        self.connection_queue = mp.Queue(maxsize=max_clients * 2)
-        self.stats_queue = mp.Queue()
-        self.worker_processes: List[mp.Process] = []
+        # Multiprocessing components; per-worker client stats tables, allocated once here and inherited by workers
+        self.table_shm = shared_memory.SharedMemory(
+            create=True, size=self.num_workers * max_clients * STATS_ROW_BYTES)
+        self.stats_table = np.ndarray((self.num_workers, max_clients, STATS_COLUMNS), dtype=np.uint64,
+                                      buffer=self.table_shm.buf)
+        self.stats_table.fill(0)
+        self.control_sockets: List[socket.socket] = []  # Parent ends of per-worker socketpairs
+        self.worker_processes: List[mp.process.BaseProcess] = []
         
-        # Server socket
+        # Server socket (only used when workers cannot share the port)
         self.server_socket = None
         self.running = False
+        self._next_worker = 0  # Round-robin target for parent-dispatched clients
         
         # Statistics
         self.total_packets = 0
         self.total_bytes = 0
         self.start_time = 0
+        self._last_stats_log = 0.0
+        self._logged_packets = 0  # Total at the last log line
         
         # Setup signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -159,20 +366,27 @@ class MultiprocessingServer:
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals"""
+        if not self.running:
+            return  # Already shutting down (e.g. a repeated signal)
         logger.info(f"Received signal {signum}, shutting down...")
         self.stop()
         sys.exit(0)
     
     def start_workers(self):
-        """Start worker processes"""
+        """Start worker processes, each with a control socketpair to the parent"""
         logger.info(f"Starting {self.num_workers} worker processes")
         
         for i in range(self.num_workers):
-            process = mp.Process(
+            # Datagram pair: one message per dispatched client fd or shutdown request
+            parent_end, child_end = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+            process = MP_CONTEXT.Process(
                 target=worker_process,
-                args=(i, self.connection_queue, self.stats_queue)
+                args=(i, self.host, self.port, self.max_clients,
+                      self.table_shm, child_end, self.reuseport)
             )
             process.start()
+            child_end.close()
+            self.control_sockets.append(parent_end)
             self.worker_processes.append(process)
             logger.info(f"Started worker process {i} (PID: {process.pid})")
     
@@ -180,9 +394,12 @@ class MultiprocessingServer:
         """Stop all worker processes"""
         logger.info("Stopping worker processes...")
         
-        # Send shutdown signals to workers
-        for _ in self.worker_processes:
-            self.connection_queue.put(None)
+        # A message without a client fd tells each worker to shut down
+        for control in self.control_sockets:
+            try:
+                control.send(b'q')
+            except OSError:
+                pass  # Worker already exited
         
         # Wait for workers to finish
         for process in self.worker_processes:
@@ -193,6 +410,9 @@ class MultiprocessingServer:
                 process.join()
         
         self.worker_processes.clear()
+        for control in self.control_sockets:
+            control.close()
+        self.control_sockets.clear()
         logger.info("All worker processes stopped")
     
     def start(self):
@@ -200,65 +420,41 @@ class MultiprocessingServer:
         logger.info(f"Starting multiprocessing server on {self.host}:{self.port}")
         logger.info(f"Workers: {self.num_workers}, Max clients: {self.max_clients}")
         
-        # Start worker processes
-        self.start_workers()
-        
-        # Create server socket with optimizations
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        
-        # Enhanced socket optimizations for high-performance server
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 131072)  # 128KB receive buffer
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 131072)  # 128KB send buffer
-        
-        # Set socket to non-blocking for better performance
-        self.server_socket.setblocking(False)
-        
-        self.server_socket.bind((self.host, self.port))
-        self.server_socket.listen(self.max_clients)
-        
         self.running = True
         self.start_time = time.time()
         
-        # Start statistics monitoring thread
-        stats_thread = threading.Thread(target=self._monitor_stats, daemon=True)
-        stats_thread.start()
+        # With SO_REUSEPORT workers accept directly and the kernel load-balances them
+        self.start_workers()
+        
+        # Single-threaded parent: stats polling runs in the select() idle path
+        selector = selectors.DefaultSelector()
+        if not self.reuseport:
+            logger.info("SO_REUSEPORT unavailable or disabled, dispatching clients from the parent")
+            self.server_socket = _create_listener(self.host, self.port, self.max_clients, reuseport=False)
+            self.server_socket.setblocking(False)
+            selector.register(self.server_socket, selectors.EVENT_READ)
         
         logger.info("Server started, waiting for connections...")
         
         try:
             while self.running:
-                try:
-                    # Non-blocking accept with retry logic
-                    client_socket, client_address = self.server_socket.accept()
-                    logger.info(f"New connection from {client_address}")
-                    
-                    # Optimize client socket
-                    client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-                    client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
-                    client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 131072)
-                    client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 131072)
-                    
-                    # Dispatch to worker via queue
-                    self.connection_queue.put((client_socket, client_address))
-                    
-                except BlockingIOError:
-                    # No connection available, continue
-                    time.sleep(0.001)  # 1ms sleep to prevent busy waiting
-                    continue
-                except socket.error as e:
-                    if self.running:
-                        logger.error(f"Socket error: {e}")
+                if selector.select(timeout=STATS_LOG_INTERVAL):
+                    self._dispatch_client()
+                
+                if self._poll_stats() and not any(p.is_alive() for p in self.worker_processes):
+                    logger.error("All worker processes exited")
                     break
                     
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt")
         finally:
+            selector.close()
             self.stop()
     
     def stop(self):
         """Stop the server"""
+        if not self.running:
+            return
         logger.info("Stopping server...")
         self.running = False
         
@@ -266,78 +462,76 @@ class MultiprocessingServer:
             self.server_socket.close()
         
         self.stop_workers()
+        
+        # Drop our table view so the mapping can be closed, then free it
+        self.stats_table = None
+        self.table_shm.close()
+        self.table_shm.unlink()
         logger.info("Server stopped")
     
-    def _monitor_stats(self):
-        """Monitor and display statistics"""
-        worker_stats = {}  # Track per-worker stats to calculate deltas
+    def _dispatch_client(self):
+        """Accept in the parent and pass the client fd to a worker, round-robin"""
+        try:
+            client_socket, client_address = self.server_socket.accept()
+        except BlockingIOError:
+            return
+        except OSError as e:
+            if self.running:
+                logger.error(f"Socket error: {e}")
+            return
         
-        while self.running:
-            try:
-                # Collect stats from workers
-                stats_data = self.stats_queue.get(timeout=1.0)
-                
-                worker_id = stats_data['worker_id']
-                client_id = stats_data['client_id']
-                current_packets = stats_data['stats']['packets_received']
-                current_bytes = stats_data['stats']['bytes_received']
-                
-                # Calculate delta from previous stats
-                worker_key = f"{worker_id}_{client_id}"
-                if worker_key in worker_stats:
-                    prev_packets, prev_bytes = worker_stats[worker_key]
-                    packet_delta = current_packets - prev_packets
-                    byte_delta = current_bytes - prev_bytes
-                    
-                    # Only add positive deltas to avoid double counting
-                    if packet_delta > 0:
-                        self.total_packets += packet_delta
-                    if byte_delta > 0:
-                        self.total_bytes += byte_delta
-                
-                # Update worker stats
-                worker_stats[worker_key] = (current_packets, current_bytes)
-                
-                # Display periodic stats
-                elapsed = time.time() - self.start_time
-                if elapsed > 0:
-                    total_rate = self.total_packets / elapsed
-                    logger.info(
-                        f"Total: {self.total_packets} packets, "
-                        f"{self.total_bytes} bytes, "
-                        f"Rate: {total_rate:.1f} packets/sec"
-                    )
-                    
-            except Empty:
-                continue
-            except Exception as e:
-                logger.error(f"Stats monitoring error: {e}")
+        logger.info(f"New connection from {client_address}")
+        try:
+            # SCM_RIGHTS straight over the worker's AF_UNIX socketpair; no pickling
+            control = self.control_sockets[self._next_worker % len(self.control_sockets)]
+            socket.send_fds(control, [b'c'], [client_socket.fileno()])
+        except OSError as e:
+            logger.error(f"Could not dispatch client {client_address}: {e}")
+        finally:
+            client_socket.close()  # The worker holds its own duplicate
+        self._next_worker += 1
+    
+    def _poll_stats(self) -> bool:
+        """Sum the worker stats tables and log totals at most once per second.
+        Returns True when a log interval has elapsed."""
+        now = time.monotonic()
+        if now - self._last_stats_log < STATS_LOG_INTERVAL:
+            return False
+        self._last_stats_log = now
+        
+        # Counters are monotonic per slot, so totals are plain column sums
+        table = self.stats_table
+        self.total_packets = int(table[:, :, STAT_PACKETS].sum())
+        self.total_bytes = int(table[:, :, STAT_BYTES].sum())
+        
+        # Display stats only when they changed since the last line
+        if self.total_packets != self._logged_packets:
+            self._logged_packets = self.total_packets
+            elapsed = time.time() - self.start_time
+            if elapsed > 0 and logger.isEnabledFor(logging.INFO):
+                logger.info(STATS_LOG_FORMAT, self.total_packets, self.total_bytes,
+                            self.total_packets / elapsed)
+        return True
 
 def main():
     """Main function"""
     import argparse
     
-    # Set process priority for better performance
+    # Set process priority once, before workers are started, so they inherit it
     try:
-        current_process = psutil.Process()
-        current_process.nice(psutil.HIGH_PRIORITY_CLASS)
+        os.nice(-5)
         print("Set high process priority for better performance")
-    except Exception as e:
+    except OSError as e:
         print(f"Could not set process priority: {e}")
     
-    # Set process affinity to use all available cores
-    try:
-        import multiprocessing
-        os.sched_setaffinity(0, range(multiprocessing.cpu_count()))
-        print(f"Set process affinity to {multiprocessing.cpu_count()} cores")
-    except Exception as e:
-        print(f"Could not set process affinity: {e}")
-    
     parser = argparse.ArgumentParser(description='Multiprocessing Server')
     parser.add_argument('--host', default='localhost', help='Server host')
     parser.add_argument('--port', type=int, default=8888, help='Server port')
     parser.add_argument('--workers', type=int, help='Number of worker processes')
     parser.add_argument('--max-clients', type=int, default=10, help='Maximum clients')
+    parser.add_argument('--no-reuseport', action='store_true',
+                       help='Accept in the parent and pass client fds to workers over AF_UNIX '
+                            'sockets instead of SO_REUSEPORT (POSIX only)')
     
     args = parser.parse_args()
     
@@ -345,7 +539,8 @@ def main():
         host=args.host,
         port=args.port,
         num_workers=args.workers,
-        max_clients=args.max_clients
+        max_clients=args.max_clients,
+        reuseport=not args.no_reuseport
     )
     
     try:
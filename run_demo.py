@@ -51,9 +51,8 @@ class DemoRunner:
         
         process = subprocess.Popen(
             cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+            stdout=subprocess.DEVNULL,  # Never read; a full PIPE would block the child
+            stderr=subprocess.DEVNULL
         )
         
         self.processes.append(("server", process))
@@ -78,9 +77,8 @@ class DemoRunner:
         
         process = subprocess.Popen(
             cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+            stdout=subprocess.DEVNULL,  # Never read; a full PIPE would block the child
+            stderr=subprocess.DEVNULL
         )
         
         self.processes.append(("monitor", process))
@@ -98,30 +96,26 @@ class DemoRunner:
         """Start client simulators"""
         logger.info(f"Starting {num_clients} clients at {packet_rate} Hz for {duration} seconds...")
         
-        clients = []
-        for i in range(num_clients):
-            cmd = [
-                sys.executable, "client_simulator.py",
-                "--host", "localhost",
-                "--port", "8888",
-                "--clients", "1",
-                "--rate", str(packet_rate),
-                "--duration", str(duration)
-            ]
-            
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            clients.append(process)
-            self.processes.append((f"client_{i}", process))
-            time.sleep(0.5)  # Stagger client starts
+        # One simulator runs all clients; it starts them together once all are connected
+        cmd = [
+            sys.executable, "client_simulator.py",
+            "--host", "localhost",
+            "--port", "8888",
+            "--clients", str(num_clients),
+            "--rate", str(packet_rate),
+            "--duration", str(duration)
+        ]
+        
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        
+        self.processes.append(("clients", process))
         
-        logger.info(f"Started {num_clients} client processes")
-        return clients
+        logger.info(f"Started client simulator with {num_clients} clients")
+        return [process]
     
     def stop_all(self):
         """Stop all processes"""
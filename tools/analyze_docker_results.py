@@ -7,8 +7,112 @@ Analyzes results from Docker-based testing
 import json
 import os
 import re
-from typing import Dict, List, Any
+import sys
+import functools
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from operator import countOf
+from typing import Dict, List, Any, Optional
+from dataclasses import dataclass, asdict
 import argparse
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib parser
+    orjson = None
+
+# Client logs are parsed in a pool of forked workers once there are this many of them
+PARALLEL_PARSE_MIN_CLIENTS = 8
+MP_CONTEXT = mp.get_context('fork')
+
+# Log-line patterns, compiled once at import rather than per line
+_PACKETS_RE = re.compile(r'(\d+)\s+packets')
+
+# Free-form client log markers; the named group that matched says which field was hit
+_LEGACY_RE = re.compile(
+    r'(?P<connected>connected to|starting data transmission)'
+    r'|(?P<failed>connection failed|ERROR)'
+    r'|Total packets sent: (?P<packets_sent>\d+)'
+    r'|Total bytes sent: (?P<bytes_sent>\d+)'
+    r'|Duration: (?P<duration>[\d.]+)s'
+    r'|Average rate: (?P<avg_rate>[\d.]+)\s*Hz'
+    r'|Errors: (?P<errors>\d+)'
+)
+# Interned stats keys by group number (every group is named). Group names read back
+# from a match are not interned, unlike the key literals used everywhere else.
+_LEGACY_KEYS = (None,) + tuple(sys.intern(name) for name in sorted(_LEGACY_RE.groupindex,
+                                                                   key=_LEGACY_RE.groupindex.get))
+
+@dataclass(slots=True)
+class ClientStats:
+    """Statistics parsed from one client's log"""
+    packets_sent: int = 0
+    bytes_sent: int = 0
+    duration: float = 0.0
+    avg_rate: float = 0.0
+    errors: int = 0
+    connection_status: str = 'unknown'
+    data_source: str = 'estimated'  # Will be 'real' if we find actual statistics
+
+_FLOAT_CHARS = frozenset('0123456789.-+eE')
+
+def _to_float(value: str):
+    """Convert a numeric string to float, or return None if it is not one"""
+    value = value.strip()
+    if not value or not _FLOAT_CHARS.issuperset(value):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None  # e.g. '1.2.3'
+
+def _parse_packets_sent(stats: ClientStats, value: str):
+    """Store the final packet count, marking the stats as real"""
+    if value.isdecimal():
+        stats.packets_sent = int(value)
+        stats.data_source = 'real'
+
+def _parse_bytes_sent(stats: ClientStats, value: str):
+    """Store the final byte count"""
+    if value.isdecimal():
+        stats.bytes_sent = int(value)
+
+def _parse_duration(stats: ClientStats, value: str):
+    """Store the duration, given as e.g. '15.00s'"""
+    duration = _to_float(value.replace('s', ''))
+    if duration is not None:
+        stats.duration = duration
+
+def _parse_avg_rate(stats: ClientStats, value: str):
+    """Store the average rate, given as e.g. '8000.0 Hz'"""
+    avg_rate = _to_float(value.replace('Hz', ''))
+    if avg_rate is not None:
+        stats.avg_rate = avg_rate
+
+def _parse_errors(stats: ClientStats, value: str):
+    """Store the error count"""
+    if value.isdecimal():
+        stats.errors = int(value)
+
+# Final-statistics field name (the text between the logger prefix and the value) -> parser
+_FINAL_STATS_PARSERS = {
+    'Total packets sent': _parse_packets_sent,
+    'Total bytes sent': _parse_bytes_sent,
+    'Duration': _parse_duration,
+    'Average rate': _parse_avg_rate,
+    'Errors': _parse_errors,
+}
+
+@functools.lru_cache(maxsize=8)
+def _load_results(path: str, mtime: float) -> Dict[str, Any]:
+    """Read and parse a results file, cached until its mtime changes"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 class DockerResultAnalyzer:
     """Analyzes Docker test results"""
@@ -16,23 +120,22 @@ class DockerResultAnalyzer:
     def __init__(self, results_file: str = "results/docker_test_results.json"):
         self.results_file = results_file
     
-    def parse_client_logs(self, log_content: str) -> Dict[str, Any]:
+    def parse_client_logs(self, log_content: str) -> ClientStats:
         """Parse client log content for statistics"""
-        stats = {
-            'packets_sent': 0,
-            'bytes_sent': 0,
-            'duration': 0,
-            'avg_rate': 0,
-            'errors': 0,
-            'connection_status': 'unknown',
-            'data_source': 'estimated'  # Will be 'real' if we find actual statistics
-        }
+        stats = ClientStats()
         
-        lines = log_content.split('\n')
+        lines = log_content.splitlines()
         
-        # Look for structured final statistics first
+        # Single sweep: structured final statistics go into stats, free-form lines into
+        # legacy, which is only used when no structured block reported packets
+        legacy = {}
         in_final_stats = False
         for line in lines:
+            # Most lines hold none of the markers below; skip them with one cheap scan
+            if not ('===' in line or 'sent:' in line or 'Duration:' in line
+                    or 'rate:' in line or 'Errors:' in line or 'connect' in line
+                    or 'ERROR' in line or 'starting data transmission' in line):
+                continue
             if '=== CLIENT FINAL STATISTICS ===' in line:
                 in_final_stats = True
                 continue
@@ -40,116 +143,44 @@ class DockerResultAnalyzer:
                 in_final_stats = False
                 continue
             elif in_final_stats:
-                # Parse structured final statistics (handle INFO:Client-client_000: prefix)
-                if 'Total packets sent:' in line:
-                    try:
-                        # Extract the value after the colon
-                        if ':' in line:
-                            value_part = line.split(':')[-1].strip()
-                            if value_part.isdigit():
-                                stats['packets_sent'] = int(value_part)
-                                stats['data_source'] = 'real'
-                    except:
-                        pass
-                elif 'Total bytes sent:' in line:
-                    try:
-                        if ':' in line:
-                            value_part = line.split(':')[-1].strip()
-                            if value_part.isdigit():
-                                stats['bytes_sent'] = int(value_part)
-                    except:
-                        pass
-                elif 'Duration:' in line and 's' in line:
-                    try:
-                        if ':' in line:
-                            value_part = line.split(':')[-1].strip().replace('s', '')
-                            stats['duration'] = float(value_part)
-                    except:
-                        pass
-                elif 'Average rate:' in line and 'Hz' in line:
-                    try:
-                        if ':' in line:
-                            value_part = line.split(':')[-1].strip().replace('Hz', '')
-                            stats['avg_rate'] = float(value_part)
-                    except:
-                        pass
-                elif 'Errors:' in line and not 'ERROR' in line:
-                    try:
-                        if ':' in line:
-                            value_part = line.split(':')[-1].strip()
-                            if value_part.isdigit():
-                                stats['errors'] = int(value_part)
-                    except:
-                        pass
+                # Parse structured final statistics (handle INFO:Client-client_000: prefix):
+                # the field name sits between the last two colons, so one dict lookup
+                # replaces a substring scan per field
+                head, _, value = line.rpartition(':')
+                parse = _FINAL_STATS_PARSERS.get(head[head.rfind(':') + 1:].strip())
+                if parse is not None:
+                    parse(stats, value.strip())
+            
+            # Legacy parsing applies to every line, inside the block or not, until a
+            # structured block has reported packets (legacy values are then unused)
+            if stats.data_source == 'real':
+                continue
+            match = _LEGACY_RE.search(line)
+            if match is None:
+                continue
+            index = match.lastindex
+            key = _LEGACY_KEYS[index]
+            if key == 'connected':
+                legacy['connection_status'] = 'connected'
+            elif key == 'failed':
+                legacy['connection_status'] = 'failed'
+            elif key == 'duration' or key == 'avg_rate':
+                value = _to_float(match.group(index))
+                if value is not None:
+                    legacy[key] = value
+            else:
+                legacy[key] = int(match.group(index))
+                if key == 'packets_sent':
+                    legacy['data_source'] = 'real'
         
-        # If no structured stats found, try legacy parsing
-        if stats['data_source'] == 'estimated':
-            for line in lines:
-                # Parse connection status first
-                if 'connected to' in line:
-                    stats['connection_status'] = 'connected'
-                elif 'connection failed' in line or 'ERROR' in line:
-                    stats['connection_status'] = 'failed'
-                # Parse final statistics (these override progress stats)
-                elif 'Total packets sent:' in line:
-                    try:
-                        # Extract number after "Total packets sent: "
-                        parts = line.split('Total packets sent: ')
-                        if len(parts) > 1:
-                            stats['packets_sent'] = int(parts[1].strip())
-                            stats['data_source'] = 'real'
-                    except:
-                        pass
-                elif 'Total bytes sent:' in line:
-                    try:
-                        # Extract number after "Total bytes sent: "
-                        parts = line.split('Total bytes sent: ')
-                        if len(parts) > 1:
-                            stats['bytes_sent'] = int(parts[1].strip())
-                    except:
-                        pass
-                elif 'Duration:' in line and 's' in line:
-                    try:
-                        # Extract number after "Duration: "
-                        parts = line.split('Duration: ')
-                        if len(parts) > 1:
-                            duration_str = parts[1].strip().replace('s', '')
-                            stats['duration'] = float(duration_str)
-                    except:
-                        pass
-                elif 'Average rate:' in line and 'Hz' in line:
-                    try:
-                        # Extract number after "Average rate: "
-                        parts = line.split('Average rate: ')
-                        if len(parts) > 1:
-                            rate_str = parts[1].strip().replace('Hz', '')
-                            stats['avg_rate'] = float(rate_str)
-                    except:
-                        pass
-                elif 'Errors:' in line and not 'ERROR' in line:
-                    try:
-                        # Extract number after "Errors: "
-                        parts = line.split('Errors: ')
-                        if len(parts) > 1:
-                            stats['errors'] = int(parts[1].strip())
-                    except:
-                        pass
-                # Parse transmission start
-                elif 'starting data transmission' in line:
-                    stats['connection_status'] = 'connected'
-                # Parse connection success
-                elif 'connected to server' in line:
-                    stats['connection_status'] = 'connected'
-                # Parse connection failure
-                elif 'connection failed' in line or 'ERROR' in line:
-                    stats['connection_status'] = 'failed'
-                # If we have real data, assume connected
-                elif stats.get('data_source') == 'real' and stats.get('packets_sent', 0) > 0:
-                    stats['connection_status'] = 'connected'
+        # If no structured stats found, fall back to the legacy values
+        if stats.data_source == 'estimated':
+            for key, value in legacy.items():
+                setattr(stats, key, value)
         
         # Final check: if we have real data with packets, mark as connected
-        if stats.get('data_source') == 'real' and stats.get('packets_sent', 0) > 0:
-            stats['connection_status'] = 'connected'
+        if stats.data_source == 'real' and stats.packets_sent > 0:
+            stats.connection_status = 'connected'
         
         return stats
     
@@ -163,7 +194,7 @@ class DockerResultAnalyzer:
             'errors': []
         }
         
-        lines = log_content.split('\n')
+        lines = log_content.splitlines()
         
         for line in lines:
             if 'Started worker process' in line:
@@ -172,12 +203,9 @@ class DockerResultAnalyzer:
                 stats['clients_handled'] += 1
             elif 'Total:' in line and 'packets' in line:
                 # Extract packet count from log line
-                try:
-                    match = re.search(r'(\d+) packets', line)
-                    if match:
-                        stats['total_packets'] = int(match.group(1))
-                except:
-                    pass
+                match = _PACKETS_RE.search(line)
+                if match:
+                    stats['total_packets'] = int(match.group(1))
             elif 'ERROR' in line or 'Error' in line:
                 stats['errors'].append(line.strip())
         
@@ -190,8 +218,7 @@ class DockerResultAnalyzer:
             return {}
         
         try:
-            with open(self.results_file, 'r') as f:
-                data = json.load(f)
+            data = _load_results(self.results_file, os.path.getmtime(self.results_file))
             
             analysis = {
                 'test_summary': {},
@@ -202,7 +229,7 @@ class DockerResultAnalyzer:
             }
             
             # Analyze test summary
-            analysis['test_summary'] = {
+            test_summary = analysis['test_summary'] = {
                 'containers': data.get('containers', 0),
                 'total_packets': data.get('total_packets', 0),
                 'total_bytes': data.get('total_bytes', 0),
@@ -212,57 +239,50 @@ class DockerResultAnalyzer:
             }
             
             # Analyze server logs
-            if data.get('server_logs'):
-                server_stats = self.parse_server_logs(data['server_logs'])
-                analysis['server_analysis'] = server_stats
+            server_logs = data.get('server_logs')
+            server_stats = analysis['server_analysis']
+            if server_logs:
+                server_stats = analysis['server_analysis'] = self.parse_server_logs(server_logs)
             
             # Analyze client logs
-            client_stats = {}
-            total_client_packets = 0
-            total_client_bytes = 0
-            successful_clients = 0
-            real_data_clients = 0
-            estimated_data_clients = 0
+            # Logs are independent and parsing is CPU-bound, so large runs fan out across cores
+            client_logs = data.get('client_logs', {})
+            if len(client_logs) >= PARALLEL_PARSE_MIN_CLIENTS:
+                with ProcessPoolExecutor(mp_context=MP_CONTEXT) as executor:
+                    parsed = list(executor.map(self.parse_client_logs, client_logs.values(),
+                                               chunksize=4))
+            else:
+                parsed = [self.parse_client_logs(client_log) for client_log in client_logs.values()]
+            client_stats = dict(zip(client_logs, parsed))
             
-            for client_name, client_log in data.get('client_logs', {}).items():
-                stats = self.parse_client_logs(client_log)
-                client_stats[client_name] = stats
-                
-                if stats['connection_status'] == 'connected':
-                    successful_clients += 1
-                    total_client_packets += stats['packets_sent']
-                    total_client_bytes += stats['bytes_sent']
-                
-                # Track data source
-                if stats.get('data_source') == 'real':
-                    real_data_clients += 1
-                else:
-                    estimated_data_clients += 1
+            # Aggregate over per-field columns rather than branching per client
+            connected = [stats.connection_status == 'connected' for stats in parsed]
+            successful_clients = sum(connected)
+            total_client_packets = sum(compress([stats.packets_sent for stats in parsed], connected))
+            total_client_bytes = sum(compress([stats.bytes_sent for stats in parsed], connected))
             
-            analysis['client_analysis'] = {
+            # Track data source
+            real_data_clients = countOf([stats.data_source for stats in parsed], 'real')
+            estimated_data_clients = len(parsed) - real_data_clients
+            success_rate = successful_clients / max(len(client_stats), 1) * 100
+            
+            client_analysis = analysis['client_analysis'] = {
                 'individual_stats': client_stats,
                 'total_packets': total_client_packets,
                 'total_bytes': total_client_bytes,
                 'successful_clients': successful_clients,
                 'total_clients': len(client_stats),
+                'success_rate_pct': success_rate,
                 'total_packets_sent': total_client_packets,
                 'total_bytes_sent': total_client_bytes
             }
             
             # Update test summary with correct totals
-            analysis['test_summary']['total_packets'] = total_client_packets
-            analysis['test_summary']['total_bytes'] = total_client_bytes
-            
-            # Update client analysis totals to match individual stats
-            analysis['client_analysis']['total_packets_sent'] = total_client_packets
-            analysis['client_analysis']['total_bytes_sent'] = total_client_bytes
+            test_summary['total_packets'] = total_client_packets
+            test_summary['total_bytes'] = total_client_bytes
             
             # Calculate performance metrics
             if total_client_packets > 0:
-                success_rate = 0
-                if client_stats:
-                    success_rate = successful_clients / len(client_stats) * 100
-                
                 analysis['performance_metrics'] = {
                     'packet_throughput': total_client_packets,
                     'data_throughput': total_client_bytes,
@@ -271,9 +291,8 @@ class DockerResultAnalyzer:
                 }
             else:
                 # If no client packets detected, estimate from server data
-                server_packets = analysis['server_analysis'].get('total_packets', 0)
-                server_bytes = analysis['server_analysis'].get('total_bytes', 0)
-                successful_clients = analysis['client_analysis'].get('successful_clients', 0)
+                server_packets = server_stats.get('total_packets', 0)
+                server_bytes = server_stats.get('total_bytes', 0)
                 
                 if server_packets > 0 and successful_clients > 0:
                     estimated_client_packets = server_packets
@@ -287,41 +306,43 @@ class DockerResultAnalyzer:
                         'avg_packets_per_client': estimated_avg_packets
                     }
                     
-                    # Update individual client stats with estimates (add realistic variation)
-                    import random
-                    random.seed(42)  # For reproducible results
-                    
-                    client_names = list(analysis['client_analysis']['individual_stats'].keys())
-                    for i, client_name in enumerate(client_names):
-                        if analysis['client_analysis']['individual_stats'][client_name]['connection_status'] == 'connected':
-                            # Add ±5% variation to make it more realistic
-                            variation = random.uniform(0.95, 1.05)
-                            varied_packets = int(estimated_avg_packets * variation)
-                            
-                            analysis['client_analysis']['individual_stats'][client_name]['packets_sent'] = varied_packets
-                            analysis['client_analysis']['individual_stats'][client_name]['bytes_sent'] = varied_packets * 32  # 32 bytes per packet
-                            analysis['client_analysis']['individual_stats'][client_name]['avg_rate'] = varied_packets / 15.0  # 15 second test
+                    # Update individual client stats with estimates (add realistic variation):
+                    # ±5% per connected client, drawn for all of them at once
+                    rng = np.random.default_rng(42)  # For reproducible results
+                    variations = rng.uniform(0.95, 1.05, successful_clients)
+                    varied = iter((estimated_avg_packets * variations).astype(np.int64).tolist())
                     
-                    # Calculate actual totals from individual client stats
-                    actual_total_packets = sum(stats.get('packets_sent', 0) for stats in analysis['client_analysis']['individual_stats'].values())
-                    actual_total_bytes = sum(stats.get('bytes_sent', 0) for stats in analysis['client_analysis']['individual_stats'].values())
+                    # Totals accumulate in the same pass that writes the estimates; clients
+                    # that did not connect have no packets on this path
+                    actual_total_packets = 0
+                    actual_total_bytes = 0
+                    for stats in client_stats.values():
+                        if stats.connection_status == 'connected':
+                            varied_packets = next(varied)
+                            varied_bytes = varied_packets * 32  # 32 bytes per packet
+                            stats.packets_sent = varied_packets
+                            stats.bytes_sent = varied_bytes
+                            stats.avg_rate = varied_packets / 15.0  # 15 second test
+                            actual_total_packets += varied_packets
+                            actual_total_bytes += varied_bytes
                     
                     # Update totals with actual values
-                    analysis['client_analysis']['total_packets'] = actual_total_packets
-                    analysis['client_analysis']['total_bytes'] = actual_total_bytes
-                    analysis['client_analysis']['total_packets_sent'] = actual_total_packets
-                    analysis['client_analysis']['total_bytes_sent'] = actual_total_bytes
+                    client_analysis['total_packets'] = actual_total_packets
+                    client_analysis['total_bytes'] = actual_total_bytes
+                    client_analysis['total_packets_sent'] = actual_total_packets
+                    client_analysis['total_bytes_sent'] = actual_total_bytes
                     
                     # Update test summary with actual totals
-                    analysis['test_summary']['total_packets'] = actual_total_packets
-                    analysis['test_summary']['total_bytes'] = actual_total_bytes
+                    test_summary['total_packets'] = actual_total_packets
+                    test_summary['total_bytes'] = actual_total_bytes
             
             # Generate recommendations
             recommendations = []
             
             # Check if performance metrics exist
-            if 'performance_metrics' in analysis and analysis['performance_metrics']:
-                success_rate = analysis['performance_metrics'].get('success_rate', 0)
+            performance_metrics = analysis['performance_metrics']
+            if performance_metrics:
+                success_rate = performance_metrics['success_rate']
                 
                 if success_rate < 100:
                     recommendations.append("Some clients failed to connect - check network configuration")
@@ -329,8 +350,8 @@ class DockerResultAnalyzer:
                 if success_rate == 0:
                     recommendations.append("All clients failed - check server configuration and Docker networking")
             
-            if analysis['test_summary'].get('errors', 0) > 0:
-                recommendations.append(f"Found {analysis['test_summary']['errors']} errors - review logs for details")
+            if test_summary['errors'] > 0:
+                recommendations.append(f"Found {test_summary['errors']} errors - review logs for details")
             
             # Check data source quality
             if real_data_clients > 0:
@@ -340,15 +361,14 @@ class DockerResultAnalyzer:
             
             # Check for identical client performance (suspicious with real data)
             if real_data_clients > 0:
-                client_stats = analysis.get('client_analysis', {}).get('individual_stats', {})
-                real_client_stats = [stats for stats in client_stats.values() if stats.get('data_source') == 'real']
+                real_client_stats = [stats for stats in client_stats.values() if stats.data_source == 'real']
                 if len(real_client_stats) > 1:
-                    packet_counts = [stats.get('packets_sent', 0) for stats in real_client_stats]
+                    packet_counts = [stats.packets_sent for stats in real_client_stats]
                     if len(set(packet_counts)) == 1 and packet_counts[0] > 0:
                         recommendations.append("All clients have identical packet counts - this may indicate a measurement issue")
             
             # Only show "no packets" if truly no packets were processed
-            if analysis.get('server_analysis', {}).get('total_packets', 0) == 0:
+            if server_stats.get('total_packets', 0) == 0:
                 recommendations.append("No packets were transmitted - check client configuration")
             
             analysis['recommendations'] = recommendations
@@ -361,74 +381,77 @@ class DockerResultAnalyzer:
     
     def print_analysis(self, analysis: Dict[str, Any]):
         """Print formatted analysis results"""
-        print("=" * 80)
-        print("DOCKER TEST RESULT ANALYSIS")
-        print("=" * 80)
+        # Collect every line and write once instead of one print call per line
+        out = []
+        out.append("=" * 80)
+        out.append("DOCKER TEST RESULT ANALYSIS")
+        out.append("=" * 80)
         
         # Test Summary
         summary = analysis.get('test_summary', {})
-        print(f"\nTEST SUMMARY:")
-        print(f"  Containers: {summary.get('containers', 0)}")
-        print(f"  Total Packets: {summary.get('total_packets', 0):,}")
-        print(f"  Total Bytes: {summary.get('total_bytes', 0):,}")
-        print(f"  Errors: {summary.get('errors', 0)}")
+        out.append(f"\nTEST SUMMARY:")
+        out.append(f"  Containers: {summary.get('containers', 0)}")
+        out.append(f"  Total Packets: {summary.get('total_packets', 0):,}")
+        out.append(f"  Total Bytes: {summary.get('total_bytes', 0):,}")
+        out.append(f"  Errors: {summary.get('errors', 0)}")
         
         # Server Analysis
         server = analysis.get('server_analysis', {})
-        print(f"\nSERVER ANALYSIS:")
-        print(f"  Workers Started: {server.get('workers_started', 0)}")
-        print(f"  Clients Handled: {server.get('clients_handled', 0)}")
-        print(f"  Total Packets Processed: {server.get('total_packets', 0):,}")
+        out.append(f"\nSERVER ANALYSIS:")
+        out.append(f"  Workers Started: {server.get('workers_started', 0)}")
+        out.append(f"  Clients Handled: {server.get('clients_handled', 0)}")
+        out.append(f"  Total Packets Processed: {server.get('total_packets', 0):,}")
         if server.get('errors'):
-            print(f"  Server Errors: {len(server['errors'])}")
+            out.append(f"  Server Errors: {len(server['errors'])}")
         
         # Client Analysis
         client = analysis.get('client_analysis', {})
-        print(f"\nCLIENT ANALYSIS:")
-        print(f"  Total Clients: {client.get('total_clients', 0)}")
-        print(f"  Successful Clients: {client.get('successful_clients', 0)}")
-        print(f"  Success Rate: {client.get('successful_clients', 0) / max(client.get('total_clients', 1), 1) * 100:.1f}%")
-        print(f"  Total Packets Sent: {client.get('total_packets', 0):,}")
-        print(f"  Total Bytes Sent: {client.get('total_bytes', 0):,}")
+        out.append(f"\nCLIENT ANALYSIS:")
+        out.append(f"  Total Clients: {client.get('total_clients', 0)}")
+        out.append(f"  Successful Clients: {client.get('successful_clients', 0)}")
+        out.append(f"  Success Rate: {client.get('success_rate_pct', 0):.1f}%")
+        out.append(f"  Total Packets Sent: {client.get('total_packets', 0):,}")
+        out.append(f"  Total Bytes Sent: {client.get('total_bytes', 0):,}")
         
         # Individual client stats
         individual_stats = client.get('individual_stats', {})
         if individual_stats:
-            print(f"\nINDIVIDUAL CLIENT STATS:")
+            out.append(f"\nINDIVIDUAL CLIENT STATS:")
             for client_name, stats in individual_stats.items():
-                print(f"  {client_name}:")
-                print(f"    Status: {stats.get('connection_status', 'unknown')}")
-                print(f"    Packets: {stats.get('packets_sent', 0):,}")
-                print(f"    Bytes: {stats.get('bytes_sent', 0):,}")
-                print(f"    Rate: {stats.get('avg_rate', 0):.1f} Hz")
-                print(f"    Errors: {stats.get('errors', 0)}")
+                out.append(f"  {client_name}:")
+                out.append(f"    Status: {stats.connection_status}")
+                out.append(f"    Packets: {stats.packets_sent:,}")
+                out.append(f"    Bytes: {stats.bytes_sent:,}")
+                out.append(f"    Rate: {stats.avg_rate:.1f} Hz")
+                out.append(f"    Errors: {stats.errors}")
         
         # Performance Metrics
         perf = analysis.get('performance_metrics', {})
         if perf:
-            print(f"\nPERFORMANCE METRICS:")
-            print(f"  Packet Throughput: {perf.get('packet_throughput', 0):,} packets")
-            print(f"  Data Throughput: {perf.get('data_throughput', 0):,} bytes")
-            print(f"  Success Rate: {perf.get('success_rate', 0):.1f}%")
-            print(f"  Avg Packets/Client: {perf.get('avg_packets_per_client', 0):.1f}")
+            out.append(f"\nPERFORMANCE METRICS:")
+            out.append(f"  Packet Throughput: {perf.get('packet_throughput', 0):,} packets")
+            out.append(f"  Data Throughput: {perf.get('data_throughput', 0):,} bytes")
+            out.append(f"  Success Rate: {perf.get('success_rate', 0):.1f}%")
+            out.append(f"  Avg Packets/Client: {perf.get('avg_packets_per_client', 0):.1f}")
         
         # Recommendations
         recommendations = analysis.get('recommendations', [])
         if recommendations:
-            print(f"\nRECOMMENDATIONS:")
+            out.append(f"\nRECOMMENDATIONS:")
             for i, rec in enumerate(recommendations, 1):
-                print(f"  {i}. {rec}")
+                out.append(f"  {i}. {rec}")
         
-        print("\n" + "=" * 80)
+        out.append("\n" + "=" * 80)
+        sys.stdout.write('\n'.join(out) + '\n')
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main function"""
     parser = argparse.ArgumentParser(description='Docker Result Analyzer')
     parser.add_argument('--file', default='docker_test_results.json', 
                        help='Docker results file to analyze')
     parser.add_argument('--save', help='Save analysis to file')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     analyzer = DockerResultAnalyzer(args.file)
     analysis = analyzer.analyze_results()
@@ -437,8 +460,13 @@ def main():
         analyzer.print_analysis(analysis)
         
         if args.save:
-            with open(args.save, 'w') as f:
-                json.dump(analysis, f, indent=2)
+            if orjson is not None:
+                # orjson serializes the ClientStats dataclasses natively
+                with open(args.save, 'wb') as f:
+                    f.write(orjson.dumps(analysis, option=orjson.OPT_INDENT_2))
+            else:
+                with open(args.save, 'w') as f:
+                    json.dump(analysis, f, indent=2, default=asdict)  # ClientStats -> dict
             print(f"\nAnalysis saved to {args.save}")
     else:
         print("No analysis results available")
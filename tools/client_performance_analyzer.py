@@ -6,10 +6,63 @@ Investigates individual client performance issues
 
 import json
 import re
-from typing import Dict, List, Any
+import calendar
+import os
+import multiprocessing as mp
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Deque, Dict, List, Iterable, Optional, Tuple
 from dataclasses import dataclass
 import argparse
 
+try:
+    import ijson
+except ImportError:  # Fall back to loading the whole results file
+    ijson = None
+
+# Client timelines are analyzed in a pool of forked workers once there are this many of them
+PARALLEL_ANALYSIS_MIN_CLIENTS = 8
+ANALYSIS_WORKERS = os.cpu_count() or 1
+ANALYSIS_IN_FLIGHT = 2 * ANALYSIS_WORKERS  # Client logs queued to the pool at once
+MP_CONTEXT = mp.get_context('fork')
+
+# Log line timestamp, e.g. "2025-03-01 10:00:00,000"
+_TS_RE = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})')
+# Every timeline event in one pattern, found by a single finditer over the whole log;
+# the named group that closes last (match.lastgroup) says which event matched. Each
+# branch opens with a literal so the engine can still skip ahead on the first character
+_EVENT_RE = re.compile(
+    r'Total packets sent: (?P<total_packets>[^\n]*)'
+    r'|Total bytes sent: (?P<total_bytes>[^\n]*)'
+    r'|Average rate: (?P<avg_rate>[^\n]*)'
+    r'|Errors: (?P<errors>[^\n]*)'
+    r'|Client client_\S+:\s*(?P<packets>\d+)\s*packets,\s*(?P<rate>\d+(?:\.\d*)?)\s*Hz'
+    r'|starting (?P<start>data transmission)'
+    r'|connected (?P<connected>to)')
+# Server periodic stats line: "Total: <packets> packets, <bytes> bytes, Rate: ..."
+_SERVER_TOTAL_RE = re.compile(r'Total:\s*(\d+)\s*packets,\s*(\d+)\s*bytes')
+_STAT_FIELDS = frozenset(('total_packets', 'total_bytes', 'avg_rate', 'errors'))
+_LEADING_FLOAT_RE = re.compile(r'\s*\d+(?:\.\d*)?')
+
+def _fast_int(text: str) -> int:
+    """Parse a non-negative integer, or 0 if text is not one"""
+    text = text.strip()
+    return int(text) if text.isdecimal() else 0
+
+def _leading_float(text: str) -> float:
+    """Parse the number at the start of text (e.g. '10443.7 Hz'), or 0 if there is none"""
+    match = _LEADING_FLOAT_RE.match(text)
+    return float(match[0]) if match else 0
+
+@lru_cache(maxsize=128)
+def _date_to_epoch(date_str: str) -> int:
+    """Epoch seconds (UTC) at midnight of a 'YYYY-MM-DD' date"""
+    return calendar.timegm((int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+                            0, 0, 0, 0, 0, 0))
+
 @dataclass
 class ClientTimeline:
     """Client performance timeline"""
@@ -31,8 +84,6 @@ class ClientPerformanceAnalyzer:
     
     def analyze_client_timeline(self, client_log: str, client_id: str) -> ClientTimeline:
         """Analyze a client's performance timeline"""
-        lines = client_log.split('\n')
-        
         timeline = ClientTimeline(
             client_id=client_id,
             connection_time=0,
@@ -47,98 +98,75 @@ class ClientPerformanceAnalyzer:
         
         # Track performance over time
         packet_milestones = []
-        rate_history = []
+        # Only the first and last three rates feed the degradation check
+        early_rate_sum = 0.0
+        late_rates = deque(maxlen=3)
         
-        for line in lines:
-            # Parse timestamps
-            timestamp_match = re.search(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})', line)
-            if timestamp_match:
-                timestamp_str = timestamp_match.group(1)
-                # Convert to seconds since start (simplified)
-                timeline.connection_time = self._parse_timestamp(timestamp_str)
-            
-            # Track connection
-            if 'connected to' in line:
-                timeline.connection_time = self._parse_timestamp_from_line(line)
+        # One regex pass over the whole log instead of splitting it into lines; lines
+        # without an event cost no Python work, and line bounds are found only for matches
+        line_end = -1
+        for match in _EVENT_RE.finditer(client_log):
+            event_start = match.start()
+            if event_start < line_end:
+                continue  # A line carries at most one event
+            event = match.lastgroup
             
-            # Track data transmission start
-            if 'starting data transmission' in line:
-                timeline.start_time = self._parse_timestamp_from_line(line)
+            if event in _STAT_FIELDS:
+                # Track final statistics; the value group runs to the end of the line
+                line_end = match.end()
+                if event == 'avg_rate':
+                    timeline.avg_rate = _leading_float(match['avg_rate'])
+                elif event != 'errors' or client_log.find(
+                        'ERROR', client_log.rfind('\n', 0, event_start) + 1, line_end) < 0:
+                    # An ERROR-level line is not the errors total
+                    setattr(timeline, event, _fast_int(match[event]))
+                continue
             
-            # Track progress milestones
-            if 'packets,' in line and 'Hz' in line:
-                milestone = self._parse_progress_milestone(line)
-                if milestone:
-                    packet_milestones.append(milestone)
-                    rate_history.append(milestone['rate'])
-            
-            # Track final statistics
-            if 'Total packets sent:' in line:
-                timeline.total_packets = self._extract_number_after(line, 'Total packets sent: ')
-            elif 'Total bytes sent:' in line:
-                timeline.total_bytes = self._extract_number_after(line, 'Total bytes sent: ')
-            elif 'Average rate:' in line:
-                timeline.avg_rate = self._extract_number_after(line, 'Average rate: ')
-            elif 'Errors:' in line and not 'ERROR' in line:
-                timeline.errors = self._extract_number_after(line, 'Errors: ')
+            line_start = client_log.rfind('\n', 0, event_start) + 1
+            line_end = client_log.find('\n', event_start)
+            if line_end < 0:
+                line_end = len(client_log)
+            if event == 'rate':
+                # Track progress milestones, timed by the timestamp leading the progress text
+                rate = float(match['rate'])
+                timestamp_match = _TS_RE.search(client_log, line_start, event_start)
+                packet_milestones.append({
+                    'packets': int(match['packets']),
+                    'rate': rate,
+                    'timestamp': self._parse_timestamp(timestamp_match[1]) if timestamp_match else 0
+                })
+                if len(packet_milestones) <= 3:
+                    early_rate_sum += rate
+                late_rates.append(rate)
+            else:
+                # Track data transmission start / connection
+                timestamp_match = _TS_RE.search(client_log, line_start, line_end)
+                timestamp = self._parse_timestamp(timestamp_match[1]) if timestamp_match else 0
+                if event == 'start':
+                    timeline.start_time = timestamp
+                else:
+                    timeline.connection_time = timestamp
         
         # Analyze performance issues
         timeline.performance_issues = self._analyze_performance_issues(
-            packet_milestones, rate_history, timeline
+            packet_milestones, early_rate_sum, late_rates, timeline
         )
         
         return timeline
     
-    def _parse_timestamp_from_line(self, line: str) -> float:
-        """Extract timestamp from log line"""
-        timestamp_match = re.search(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})', line)
-        if timestamp_match:
-            return self._parse_timestamp(timestamp_match.group(1))
-        return 0
-    
     def _parse_timestamp(self, timestamp_str: str) -> float:
         """Parse timestamp string to seconds"""
+        # Fixed 'YYYY-MM-DD HH:MM:SS,mmm' layout: slice the fields instead of strptime.
+        # A log spans a day or two, so the date part comes from a cache
         try:
-            from datetime import datetime
-            dt = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S,%f')
-            return dt.timestamp()
-        except:
+            return (_date_to_epoch(timestamp_str[:10]) + int(timestamp_str[11:13]) * 3600
+                    + int(timestamp_str[14:16]) * 60 + int(timestamp_str[17:19])
+                    + int(timestamp_str[20:23]) / 1000.0)
+        except ValueError:
             return 0
     
-    def _parse_progress_milestone(self, line: str) -> Dict[str, Any]:
-        """Parse progress milestone from log line"""
-        try:
-            # Extract pattern: "Client client_000: 1000 packets, 4312.5 Hz"
-            if 'Client client_' in line and 'packets,' in line:
-                parts = line.split('Client client_')
-                if len(parts) > 1:
-                    after_client = parts[1].split(':')[1] if ':' in parts[1] else parts[1]
-                    packet_part = after_client.strip().split(',')[0]
-                    rate_part = after_client.strip().split(',')[1] if ',' in after_client else ''
-                    
-                    if 'packets' in packet_part and 'Hz' in rate_part:
-                        packets = int(packet_part.split()[0])
-                        rate = float(rate_part.split()[0])
-                        return {
-                            'packets': packets,
-                            'rate': rate,
-                            'timestamp': self._parse_timestamp_from_line(line)
-                        }
-        except:
-            pass
-        return None
-    
-    def _extract_number_after(self, line: str, prefix: str) -> int:
-        """Extract number after a specific prefix"""
-        try:
-            parts = line.split(prefix)
-            if len(parts) > 1:
-                return int(parts[1].strip())
-        except:
-            pass
-        return 0
-    
-    def _analyze_performance_issues(self, milestones: List[Dict], rates: List[float], timeline: ClientTimeline) -> List[str]:
+    def _analyze_performance_issues(self, milestones: List[Dict], early_rate_sum: float,
+                                    late_rates: Deque[float], timeline: ClientTimeline) -> List[str]:
         """Analyze performance issues from timeline data"""
         issues = []
         
@@ -151,14 +179,11 @@ class ClientPerformanceAnalyzer:
             issues.append(f"Low average rate: {timeline.avg_rate:.1f} Hz (expected ~8K Hz for 15s test)")
         
         # Check for rate degradation
-        if len(rates) > 5:
-            early_rates = rates[:3]
-            late_rates = rates[-3:]
-            if len(early_rates) > 0 and len(late_rates) > 0:
-                early_avg = sum(early_rates) / len(early_rates)
-                late_avg = sum(late_rates) / len(late_rates)
-                if late_avg < early_avg * 0.5:  # 50% degradation
-                    issues.append(f"Rate degradation: {early_avg:.1f} Hz -> {late_avg:.1f} Hz")
+        if len(milestones) > 5:
+            early_avg = early_rate_sum / 3
+            late_avg = sum(late_rates) / 3
+            if late_avg < early_avg * 0.5:  # 50% degradation
+                issues.append(f"Rate degradation: {early_avg:.1f} Hz -> {late_avg:.1f} Hz")
         
         # Check for connection delays
         if timeline.start_time > 0 and timeline.connection_time > 0:
@@ -172,51 +197,69 @@ class ClientPerformanceAnalyzer:
         
         return issues
     
+    def _analyze_timelines(self, client_logs: Iterable[Tuple[str, str]]) -> Dict[str, ClientTimeline]:
+        """Analyze (client_id, client_log) pairs, across processes for large runs"""
+        # Peek far enough to decide; small runs are not worth a pool's startup cost
+        pairs = list(islice(client_logs, PARALLEL_ANALYSIS_MIN_CLIENTS))
+        if len(pairs) < PARALLEL_ANALYSIS_MIN_CLIENTS:
+            analyze = self.analyze_client_timeline
+            return {client_id: analyze(client_log, client_id) for client_id, client_log in pairs}
+        
+        # Timelines are independent and parsing is CPU-bound, so fan out across cores.
+        # Executor.map would read (and pickle) every log up front; a bounded window of
+        # submissions keeps the streamed input to a few logs in memory at a time
+        timelines = {}
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS, mp_context=MP_CONTEXT) as executor:
+            for client_id, client_log in chain(pairs, client_logs):
+                if len(pending) >= ANALYSIS_IN_FLIGHT:
+                    done_id, future = pending.popleft()
+                    timelines[done_id] = future.result()
+                pending.append((client_id, executor.submit(self.analyze_client_timeline,
+                                                           client_log, client_id)))
+            for client_id, future in pending:
+                timelines[client_id] = future.result()
+        return timelines
+    
     def analyze_all_clients(self) -> Dict[str, ClientTimeline]:
         """Analyze all clients"""
         try:
-            with open(self.results_file, 'r') as f:
-                data = json.load(f)
-            
-            timelines = {}
+            if ijson is not None:
+                # Stream the file: only one client log is held in memory at a time,
+                # and only its small timeline is kept
+                with open(self.results_file, 'rb') as f:
+                    server_logs = next(ijson.items(f, 'server_logs'), '')
+                with open(self.results_file, 'rb') as f:
+                    timelines = self._analyze_timelines(ijson.kvitems(f, 'client_logs'))
+            else:
+                with open(self.results_file, 'r') as f:
+                    data = json.load(f)
+                server_logs = data.get('server_logs', '')
+                timelines = self._analyze_timelines(data.get('client_logs', {}).items())
             
             # Get server data for estimation
-            server_logs = data.get('server_logs', '')
             server_packets = 0
             server_bytes = 0
             
-            # Extract server statistics
-            for line in server_logs.split('\n'):
-                if 'Total:' in line and 'packets,' in line:
-                    try:
-                        parts = line.split('Total:')[1].split(',')
-                        if len(parts) >= 2:
-                            packet_part = parts[0].strip()
-                            byte_part = parts[1].strip()
-                            
-                            if 'packets' in packet_part:
-                                server_packets = int(packet_part.split()[0])
-                            if 'bytes' in byte_part:
-                                server_bytes = int(byte_part.split()[0])
-                    except:
-                        pass
+            # Extract server statistics: the totals are cumulative, so the last line wins
+            server_totals = _SERVER_TOTAL_RE.findall(server_logs)
+            if server_totals:
+                server_packets, server_bytes = map(int, server_totals[-1])
             
-            # Analyze each client
-            client_count = len(data.get('client_logs', {}))
+            # Fill in clients without logged totals
+            client_count = len(timelines)
             estimated_packets = server_packets // client_count if client_count > 0 else 0
             estimated_bytes = server_bytes // client_count if client_count > 0 else 0
             
-            for client_id, client_log in data.get('client_logs', {}).items():
-                timeline = self.analyze_client_timeline(client_log, client_id)
-                
-                # If no packets detected from logs, use server estimates
-                if timeline.total_packets == 0 and estimated_packets > 0:
-                    timeline.total_packets = estimated_packets
-                    timeline.total_bytes = estimated_bytes
-                    timeline.avg_rate = estimated_packets / 15.0  # 15 second test
-                    timeline.connection_status = 'connected'
-                
-                timelines[client_id] = timeline
+            if estimated_packets > 0:
+                estimated_rate = estimated_packets / 15.0  # 15 second test
+                for timeline in timelines.values():
+                    # If no packets detected from logs, use server estimates
+                    if timeline.total_packets == 0:
+                        timeline.total_packets = estimated_packets
+                        timeline.total_bytes = estimated_bytes
+                        timeline.avg_rate = estimated_rate
+                        timeline.connection_status = 'connected'
             
             return timelines
             
@@ -230,11 +273,14 @@ class ClientPerformanceAnalyzer:
         print("CLIENT PERFORMANCE ANALYSIS")
         print("=" * 80)
         
+        # Load each client's packet count once for the sort, total and underperformer pass
+        packet_counts = [(client_id, timeline.total_packets, timeline)
+                         for client_id, timeline in timelines.items()]
+        
         # Sort clients by performance
-        sorted_clients = sorted(timelines.items(), 
-                              key=lambda x: x[1].total_packets, reverse=True)
+        sorted_clients = sorted(packet_counts, key=itemgetter(1), reverse=True)
         
-        for client_id, timeline in sorted_clients:
+        for client_id, _, timeline in sorted_clients:
             print(f"\nCLIENT: {client_id}")
             print(f"  Packets: {timeline.total_packets:,}")
             print(f"  Bytes: {timeline.total_bytes:,}")
@@ -250,24 +296,24 @@ class ClientPerformanceAnalyzer:
         
         # Summary
         print(f"\nSUMMARY:")
-        total_packets = sum(t.total_packets for t in timelines.values())
+        total_packets = sum(map(itemgetter(1), packet_counts))
         avg_packets = total_packets / len(timelines) if timelines else 0
         print(f"  Total packets: {total_packets:,}")
         print(f"  Average per client: {avg_packets:,.0f}")
         
         # Identify underperforming clients
-        underperformers = [c for c, t in timelines.items() 
-                          if t.total_packets < avg_packets * 0.5]
+        threshold = avg_packets * 0.5
+        underperformers = [c for c, packets, _ in packet_counts if packets < threshold]
         if underperformers:
             print(f"  Underperforming clients: {', '.join(underperformers)}")
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main function"""
     parser = argparse.ArgumentParser(description='Client Performance Analyzer')
     parser.add_argument('--file', default='docker_test_results.json', 
                        help='Docker results file to analyze')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     analyzer = ClientPerformanceAnalyzer(args.file)
     timelines = analyzer.analyze_all_clients()
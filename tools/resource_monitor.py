@@ -8,22 +8,114 @@ import subprocess
 import json
 import time
 import threading
-from typing import Dict, List, Any
+import glob
+import os
+import re
+from array import array
+from statistics import fmean
+from typing import Dict, List, Any, Tuple
+import numpy as np
 import psutil
 
+# Per-container cgroup directories: cgroup v2 with the systemd and cgroupfs drivers
+CGROUP_V2_GLOBS = ('/sys/fs/cgroup/system.slice/docker-*.scope', '/sys/fs/cgroup/docker/*/')
+# cgroup v1 keeps CPU and memory accounting in separate, mirrored hierarchies
+CGROUP_V1_CPU_ROOT = '/sys/fs/cgroup/cpuacct'
+CGROUP_V1_MEMORY_ROOT = '/sys/fs/cgroup/memory'
+CGROUP_V1_GLOBS = ('docker/*/', 'system.slice/docker-*.scope/')
+# Shorter sample columns are summarized with fmean/max, which beat NumPy's per-call overhead
+NUMPY_SUMMARY_MIN_SAMPLES = 128
+
+# Leading "<value><unit>" of a docker stats MemUsage field, e.g. "20.5MiB / 1.9GiB"
+_MEM_RE = re.compile(r'([\d.]+)\s*([kKMGT]?i?B)')
+_MEM_UNIT_MB = {
+    'B': 1 / (1024 * 1024), 'kB': 1000 / (1024 * 1024), 'KB': 1000 / (1024 * 1024), 'KiB': 1 / 1024,
+    'MB': 1000 ** 2 / (1024 * 1024), 'MiB': 1.0, 'GB': 1000 ** 3 / (1024 * 1024), 'GiB': 1024.0,
+    'TB': 1000 ** 4 / (1024 * 1024), 'TiB': 1024.0 * 1024
+}
+
+def _summarize(samples: array) -> Tuple[float, float]:
+    """Mean and peak of a sample column, or zeros when it is empty"""
+    if not samples:
+        return 0, 0
+    if len(samples) < NUMPY_SUMMARY_MIN_SAMPLES:
+        return fmean(samples), max(samples)
+    column = np.frombuffer(samples, dtype=np.float64)
+    return float(column.mean()), float(column.max())
+
+def _read_int(path: str) -> int:
+    """Read a single-integer cgroup file"""
+    with open(path) as f:
+        return int(f.read())
+
+def _read_cgroup_stats() -> Dict[str, Tuple[int, int]]:
+    """Read cumulative CPU time (ns) and memory usage (bytes) for each running container"""
+    stats = {}
+    for pattern in CGROUP_V2_GLOBS:
+        for path in glob.glob(pattern):
+            name = os.path.basename(path.rstrip('/'))
+            container_id = name[7:-6] if name.endswith('.scope') else name
+            try:
+                with open(os.path.join(path, 'cpu.stat')) as f:
+                    # First line is "usage_usec <n>"
+                    cpu_ns = int(f.readline().split()[1]) * 1000
+                memory = _read_int(os.path.join(path, 'memory.current'))
+            except (OSError, ValueError, IndexError):
+                continue  # Container exited between the glob and the read
+            stats[container_id] = (cpu_ns, memory)
+    if stats:
+        return stats
+    
+    for pattern in CGROUP_V1_GLOBS:
+        for path in glob.glob(os.path.join(CGROUP_V1_CPU_ROOT, pattern)):
+            relative = os.path.relpath(path, CGROUP_V1_CPU_ROOT)
+            name = os.path.basename(relative)
+            container_id = name[7:-6] if name.endswith('.scope') else name
+            try:
+                cpu_ns = _read_int(os.path.join(path, 'cpuacct.usage'))
+                memory = _read_int(os.path.join(CGROUP_V1_MEMORY_ROOT, relative, 'memory.usage_in_bytes'))
+            except (OSError, ValueError):
+                continue
+            stats[container_id] = (cpu_ns, memory)
+    return stats
+
+def _docker_container_names() -> Dict[str, str]:
+    """Map full container IDs to names with a single docker ps call"""
+    result = subprocess.run(
+        ['docker', 'ps', '--no-trunc', '--format', '{{.ID}} {{.Names}}'],
+        capture_output=True, text=True, encoding='utf-8', errors='ignore'
+    )
+    names = {}
+    if result.returncode == 0:
+        for line in result.stdout.splitlines():
+            container_id, _, name = line.partition(' ')
+            if name:
+                names[container_id] = name
+    return names
+
 class ResourceMonitor:
     """Monitor Docker container resources"""
     
     def __init__(self):
         self.monitoring = False
         self.resource_data = []
-        self.system_data = []
+        self._allocate_system_buffers(0)
+    
+    def _allocate_system_buffers(self, duration: int):
+        """Preallocate one slot per 2-second system sample in flat typed columns"""
+        slots = duration // 2 + 1
+        self.system_samples = 0
+        self.system_timestamps = array('d', [0.0]) * slots
+        self.system_cpu = array('d', [0.0]) * slots
+        self.system_memory = array('d', [0.0]) * slots
+        self.system_memory_available = array('Q', [0]) * slots
+        self.system_disk = array('d', [0.0]) * slots
     
     def start_monitoring(self, duration: int = 35):
         """Start monitoring resources"""
         self.monitoring = True
         self.resource_data = []
-        self.system_data = []
+        self._allocate_system_buffers(duration)
         
         print("Starting resource monitoring...")
         
@@ -42,35 +134,47 @@ class ResourceMonitor:
     
     def _monitor_docker_resources(self, duration: int):
         """Monitor Docker container resources"""
+        if _read_cgroup_stats():
+            self._monitor_cgroup_resources(duration)
+            return
+        
+        # No cgroup files visible (e.g. Docker Desktop): stream from the CLI
+        try:
+            self._stream_docker_stats(duration)
+        except Exception as e:
+            print(f"Docker monitoring error: {e}")
+    
+    def _monitor_cgroup_resources(self, duration: int):
+        """Sample container resources from the accounting files Docker itself reads"""
         start_time = time.time()
+        container_names = {}
+        previous = {}
         
         while self.monitoring and (time.time() - start_time) < duration:
             try:
-                # Get Docker stats
-                result = subprocess.run(
-                    ['docker', 'stats', '--no-stream', '--format', 
-                     'json'],
-                    capture_output=True, text=True, encoding='utf-8', errors='ignore'
-                )
+                now = time.time()
+                cgroup_stats = _read_cgroup_stats()
+                if not cgroup_stats.keys() <= container_names.keys():
+                    container_names = _docker_container_names()
                 
-                if result.returncode == 0:
-                    # Parse JSON output
-                    lines = result.stdout.strip().split('\n')
-                    container_stats = []
-                    
-                    for line in lines:
-                        if line.strip():
-                            try:
-                                stats = json.loads(line)
-                                container_stats.append(stats)
-                            except json.JSONDecodeError:
-                                continue
-                    
-                    if container_stats:
-                        self.resource_data.append({
-                            'timestamp': time.time(),
-                            'containers': container_stats
+                container_stats = []
+                for container_id, (cpu_ns, memory) in cgroup_stats.items():
+                    last = previous.get(container_id)
+                    if last:
+                        # CPU time over wall time, scaled like docker stats (100% per core)
+                        cpu_percent = (cpu_ns - last[0]) / ((now - last[1]) * 1e7)
+                        container_stats.append({
+                            'Name': container_names.get(container_id, container_id[:12]),
+                            'CPUPerc': f"{cpu_percent:.2f}%",
+                            'MemUsage': f"{memory}B"
                         })
+                    previous[container_id] = (cpu_ns, now)
+                
+                if container_stats:
+                    self.resource_data.append({
+                        'timestamp': now,
+                        'containers': container_stats
+                    })
                 
                 time.sleep(2)  # Sample every 2 seconds
                 
@@ -78,30 +182,81 @@ class ResourceMonitor:
                 print(f"Docker monitoring error: {e}")
                 time.sleep(2)
     
+    def _stream_docker_stats(self, duration: int):
+        """Sample container resources from one long-lived docker stats process"""
+        process = subprocess.Popen(
+            ['docker', 'stats', '--no-trunc', '--format', '{{json .}}'],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding='utf-8', errors='ignore'
+        )
+        # Streaming docker stats never exits on its own
+        timer = threading.Timer(duration, process.terminate)
+        timer.start()
+        
+        frame = {}
+        last_sample = 0.0
+        try:
+            for line in process.stdout:
+                if not self.monitoring:
+                    break
+                
+                # Each refresh starts with terminal escape codes ahead of the first JSON line
+                start = line.find('{')
+                if start < 0:
+                    continue
+                try:
+                    stats = json.loads(line[start:])
+                except json.JSONDecodeError:
+                    continue
+                
+                container_id = stats.get('ID')
+                if start or container_id in frame:
+                    # A new refresh began; keep one sample every 2 seconds
+                    now = time.time()
+                    if frame and now - last_sample >= 2:
+                        self.resource_data.append({
+                            'timestamp': now,
+                            'containers': list(frame.values())
+                        })
+                        last_sample = now
+                    frame = {}
+                frame[container_id] = stats
+        finally:
+            timer.cancel()
+            process.terminate()
+            process.wait()
+    
     def _monitor_system_resources(self, duration: int):
         """Monitor system resources"""
         start_time = time.time()
+        next_sample = start_time
+        # Prime the CPU counters so each reading covers the whole interval since the last one
+        psutil.cpu_percent(interval=None)
         
-        while self.monitoring and (time.time() - start_time) < duration:
+        while self.monitoring:
+            # Sample every 2 seconds on a fixed schedule, not 2 seconds after the last sample
+            next_sample += 2
+            if next_sample - start_time > duration:
+                break
+            time.sleep(max(0, next_sample - time.time()))
             try:
                 # Get system stats
-                cpu_percent = psutil.cpu_percent(interval=1)
+                cpu_percent = psutil.cpu_percent(interval=None)
                 memory = psutil.virtual_memory()
                 disk = psutil.disk_usage('/')
                 
-                self.system_data.append({
-                    'timestamp': time.time(),
-                    'cpu_percent': cpu_percent,
-                    'memory_percent': memory.percent,
-                    'memory_available': memory.available,
-                    'disk_percent': disk.percent
-                })
-                
-                time.sleep(2)  # Sample every 2 seconds
+                index = self.system_samples
+                if index == len(self.system_timestamps):
+                    break
+                self.system_timestamps[index] = time.time()
+                self.system_cpu[index] = cpu_percent
+                self.system_memory[index] = memory.percent
+                self.system_memory_available[index] = memory.available
+                self.system_disk[index] = disk.percent
+                self.system_samples = index + 1
                 
             except Exception as e:
                 print(f"System monitoring error: {e}")
-                time.sleep(2)
     
     def stop_monitoring(self):
         """Stop monitoring"""
@@ -109,7 +264,7 @@ class ResourceMonitor:
     
     def _generate_report(self) -> Dict[str, Any]:
         """Generate resource usage report"""
-        if not self.resource_data and not self.system_data:
+        if not self.resource_data and not self.system_samples:
             return {}
         
         report = {
@@ -129,9 +284,10 @@ class ResourceMonitor:
         if not self.resource_data:
             return {}
         
+        # Samples are kept as compact float64 columns rather than lists of Python floats
         container_analysis = {}
-        all_cpu_usage = []
-        all_memory_usage = []
+        all_cpu_usage = array('d')
+        all_memory_usage = array('d')
         
         for sample in self.resource_data:
             for container in sample['containers']:
@@ -139,9 +295,8 @@ class ResourceMonitor:
                 
                 if container_name not in container_analysis:
                     container_analysis[container_name] = {
-                        'cpu_samples': [],
-                        'memory_samples': [],
-                        'network_samples': []
+                        'cpu_samples': array('d'),
+                        'memory_samples': array('d')
                     }
                 
                 # Parse CPU usage
@@ -150,57 +305,57 @@ class ResourceMonitor:
                     cpu_usage = float(cpu_str)
                     container_analysis[container_name]['cpu_samples'].append(cpu_usage)
                     all_cpu_usage.append(cpu_usage)
-                except:
+                except ValueError:
                     pass
                 
                 # Parse memory usage
-                memory_str = container.get('MemUsage', '0B / 0B').split(' / ')[0]
-                try:
-                    if 'GiB' in memory_str:
-                        memory_mb = float(memory_str.replace('GiB', '')) * 1024
-                    elif 'MiB' in memory_str:
-                        memory_mb = float(memory_str.replace('MiB', ''))
-                    else:
-                        memory_mb = float(memory_str.replace('B', '')) / (1024 * 1024)
-                    
+                match = _MEM_RE.match(container.get('MemUsage', '0B / 0B'))
+                if match:
+                    try:
+                        memory_mb = float(match[1]) * _MEM_UNIT_MB[match[2]]
+                    except (ValueError, KeyError):
+                        continue
                     container_analysis[container_name]['memory_samples'].append(memory_mb)
                     all_memory_usage.append(memory_mb)
-                except:
-                    pass
         
         # Calculate averages and peaks
         analysis = {}
         for container_name, data in container_analysis.items():
             if data['cpu_samples']:
+                avg_cpu, max_cpu = _summarize(data['cpu_samples'])
+                avg_memory, max_memory = _summarize(data['memory_samples'])
                 analysis[container_name] = {
-                    'avg_cpu': sum(data['cpu_samples']) / len(data['cpu_samples']),
-                    'max_cpu': max(data['cpu_samples']),
-                    'avg_memory_mb': sum(data['memory_samples']) / len(data['memory_samples']),
-                    'max_memory_mb': max(data['memory_samples']) if data['memory_samples'] else 0
+                    'avg_cpu': avg_cpu,
+                    'max_cpu': max_cpu,
+                    'avg_memory_mb': avg_memory,
+                    'max_memory_mb': max_memory
                 }
         
+        overall_avg_cpu, overall_max_cpu = _summarize(all_cpu_usage)
+        overall_avg_memory, overall_max_memory = _summarize(all_memory_usage)
         return {
             'containers': analysis,
-            'overall_avg_cpu': sum(all_cpu_usage) / len(all_cpu_usage) if all_cpu_usage else 0,
-            'overall_max_cpu': max(all_cpu_usage) if all_cpu_usage else 0,
-            'overall_avg_memory_mb': sum(all_memory_usage) / len(all_memory_usage) if all_memory_usage else 0,
-            'overall_max_memory_mb': max(all_memory_usage) if all_memory_usage else 0
+            'overall_avg_cpu': overall_avg_cpu,
+            'overall_max_cpu': overall_max_cpu,
+            'overall_avg_memory_mb': overall_avg_memory,
+            'overall_max_memory_mb': overall_max_memory
         }
     
     def _analyze_system_stats(self) -> Dict[str, Any]:
         """Analyze system statistics"""
-        if not self.system_data:
+        samples = self.system_samples
+        if not samples:
             return {}
         
-        cpu_samples = [s['cpu_percent'] for s in self.system_data]
-        memory_samples = [s['memory_percent'] for s in self.system_data]
+        avg_cpu, max_cpu = _summarize(self.system_cpu[:samples])
+        avg_memory, max_memory = _summarize(self.system_memory[:samples])
         
         return {
-            'avg_cpu_percent': sum(cpu_samples) / len(cpu_samples),
-            'max_cpu_percent': max(cpu_samples),
-            'avg_memory_percent': sum(memory_samples) / len(memory_samples),
-            'max_memory_percent': max(memory_samples),
-            'samples': len(self.system_data)
+            'avg_cpu_percent': avg_cpu,
+            'max_cpu_percent': max_cpu,
+            'avg_memory_percent': avg_memory,
+            'max_memory_percent': max_memory,
+            'samples': samples
         }
     
     def _generate_recommendations(self, report: Dict[str, Any]):
@@ -5,20 +5,86 @@ Runs comprehensive tests with all optimizations applied
 """
 
 import subprocess
+import sys
 import time
 import json
-import argparse
 import threading
-from typing import Dict, Any
+import io
+import mmap
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Any, BinaryIO
 import os
+import shutil
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib serializer
+    orjson = None
+
+# Clients transmit for 30 s; shorter runs are extended to let them finish
+MIN_TEST_DURATION = 35
+RESULTS_FILE = 'results/docker_test_results.json'
+RAW_LOGS_FILE = 'results/raw_logs.txt'
+
+# Compose files in order of preference (the original single-client file performs best)
+COMPOSE_FILES = (
+    'docker-compose.yml',
+    'docker-compose-optimized.yml',
+    'docker-compose-final.yml',
+    'docker-compose-stable.yml',
+    'docker-compose-fixed.yml',
+    'docker-compose-simple-optimized.yml'
+)
+
+# Optimizations listed in every report
+OPTIMIZATIONS_APPLIED = (
+    'Docker network optimization',
+    'System network limits',
+    'Enhanced performance monitoring',
+    'Optimized client simulator',
+    'Resource limits and constraints'
+)
+
+def _write_json(path: str, data: Dict[str, Any]):
+    """Write data as indented JSON; the log blobs make this worth doing in C"""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode('utf-8')
+    
+    # One unbuffered write of the finished payload, no file-object layer in between
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def _read_text(path: str) -> str:
+    """Decode a file straight from its mapped pages, without an intermediate bytes copy"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''  # Empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return str(mapped, 'utf-8', 'ignore')
+
+def _run_captured(main: Callable[[List[str]], None], argv: List[str]) -> str:
+    """Run a sibling tool's main() in-process with the given arguments, returning its output"""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        main(argv)
+    return output.getvalue()
 
 class OptimizedTestRunner:
     """Runs optimized tests with comprehensive monitoring"""
     
     def __init__(self):
         self.results = {}
-        self.monitor_thread = None
-        self.monitoring = False
+        self.monitor_process = None
+        # Resolve the binaries once instead of a PATH search per invocation
+        self.compose_bin = shutil.which('docker-compose') or 'docker-compose'
+        self.docker_bin = shutil.which('docker') or 'docker'
     
     def run_optimized_test(self, duration: int = 60) -> Dict[str, Any]:
         """Run optimized Docker test with monitoring"""
@@ -36,7 +102,11 @@ class OptimizedTestRunner:
         
         # Step 3: Start enhanced monitoring
         print("\n3. Starting enhanced performance monitoring...")
-        self._start_monitoring()
+        self._start_monitoring(duration)
+        
+        # Keep the orchestration loop on one core for the test window; pinned only after
+        # the monitor starts so it does not inherit the single-core mask and priority
+        pinned = self._pin_runner()
         
         # Step 4: Run optimized test
         print(f"\n4. Running optimized test for {duration} seconds...")
@@ -45,6 +115,8 @@ class OptimizedTestRunner:
         # Step 5: Stop monitoring and analyze
         print("\n5. Analyzing results...")
         self._stop_monitoring()
+        # The analyzers fork worker pools, which would inherit a single-core mask
+        self._unpin_runner(pinned)
         analysis = self._analyze_results()
         
         # Step 6: Generate comprehensive report
@@ -53,12 +125,38 @@ class OptimizedTestRunner:
         
         return test_results
     
+    def _pin_runner(self):
+        """Pin the runner to the last allowed core and raise its priority, returning the old state"""
+        try:
+            allowed = os.sched_getaffinity(0)
+            os.sched_setaffinity(0, {max(allowed)})
+            print(f"Runner pinned to CPU core {max(allowed)}")
+        except (AttributeError, OSError) as e:
+            print(f"Could not set runner affinity: {e}")
+            allowed = None
+        
+        try:
+            os.nice(-5)  # Needs root
+            reniced = True
+        except (AttributeError, OSError):
+            reniced = False
+        return allowed, reniced
+    
+    def _unpin_runner(self, pinned):
+        """Restore the affinity and priority saved by _pin_runner"""
+        allowed, reniced = pinned
+        if allowed:
+            os.sched_setaffinity(0, allowed)
+        if reniced:
+            os.nice(5)
+    
     def _analyze_network(self):
         """Analyze current Docker network configuration"""
         try:
-            result = subprocess.run(
-                ['python', 'docker_network_optimizer.py', '--analyze'],
-                capture_output=True, text=True, encoding='utf-8', errors='ignore'
+            # Only completion matters; discard the output rather than capture and decode it
+            subprocess.run(
+                [sys.executable, 'docker_network_optimizer.py', '--analyze'],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
             )
             print("Network analysis completed")
         except Exception as e:
@@ -68,140 +166,131 @@ class OptimizedTestRunner:
         """Apply Docker and system optimizations"""
         try:
             # Apply Docker network optimizations
-            result = subprocess.run(
-                ['python', 'docker_network_optimizer.py', '--optimize', '--create-compose'],
-                capture_output=True, text=True, encoding='utf-8', errors='ignore'
+            subprocess.run(
+                [sys.executable, 'docker_network_optimizer.py', '--optimize', '--create-compose'],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
             )
             print("Docker optimizations applied")
         except Exception as e:
             print(f"Optimization error: {e}")
     
-    def _start_monitoring(self):
+    def _start_monitoring(self, duration: int):
         """Start enhanced performance monitoring"""
         try:
-            self.monitoring = True
-            self.monitor_thread = threading.Thread(
-                target=self._monitor_loop, daemon=True
+            # The duration is only a backstop; _stop_monitoring ends the monitor with the test
+            self.monitor_process = subprocess.Popen(
+                [sys.executable, 'enhanced_performance_monitor.py', '--duration', str(max(duration, MIN_TEST_DURATION) + 5),
+                 '--interval', '0.5'],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
             )
-            self.monitor_thread.start()
             print("Enhanced monitoring started")
         except Exception as e:
             print(f"Monitoring start error: {e}")
     
-    def _monitor_loop(self):
-        """Monitoring loop"""
-        try:
-            result = subprocess.run(
-                ['python', 'enhanced_performance_monitor.py', '--duration', '120', '--interval', '0.5'],
-                capture_output=True, text=True, encoding='utf-8', errors='ignore'
-            )
-        except Exception as e:
-            print(f"Monitoring error: {e}")
-    
     def _run_optimized_docker_test(self, duration: int) -> Dict[str, Any]:
         """Run optimized Docker test"""
         try:
-            # Use original single-client compose file (prefer original for best performance)
-            compose_file = "docker-compose.yml"
-            if not os.path.exists(compose_file):
-                compose_file = "docker-compose-optimized.yml"
-            if not os.path.exists(compose_file):
-                compose_file = "docker-compose-final.yml"
-            if not os.path.exists(compose_file):
-                compose_file = "docker-compose-stable.yml"
-            if not os.path.exists(compose_file):
-                compose_file = "docker-compose-fixed.yml"
-            if not os.path.exists(compose_file):
-                compose_file = "docker-compose-simple-optimized.yml"
+            # Pick the first preferred compose file present, from one directory listing
+            with os.scandir('.') as entries:
+                present = {entry.name for entry in entries if entry.is_file()}
+            compose_file = next((name for name in COMPOSE_FILES if name in present), COMPOSE_FILES[-1])
             
             print(f"Using compose file: {compose_file}")
             
             # Ensure duration is sufficient for client completion (30s transmission + 5s buffer)
-            min_duration = 35
-            if duration < min_duration:
-                print(f"Warning: Duration {duration}s is too short for client completion. Using {min_duration}s instead.")
-                duration = min_duration
+            if duration < MIN_TEST_DURATION:
+                print(f"Warning: Duration {duration}s is too short for client completion. Using {MIN_TEST_DURATION}s instead.")
+                duration = MIN_TEST_DURATION
             
             # Build and start services
             print("Building optimized images...")
+            # Build output can be large; keep only stderr, and decode it only on failure
             build_result = subprocess.run(
-                ['docker-compose', '-f', compose_file, 'build'],
-                capture_output=True, text=True, encoding='utf-8', errors='ignore'
+                [self.compose_bin, '-f', compose_file, 'build'],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
             )
             
             if build_result.returncode != 0:
-                print(f"Build failed: {build_result.stderr}")
+                print(f"Build failed: {build_result.stderr.decode('utf-8', 'ignore')}")
                 return {}
             
+            # Detached up returns once the server is healthy and the clients have started,
+            # so the test duration below covers the clients' run rather than their startup
             print("Starting optimized services...")
             start_result = subprocess.run(
-                ['docker-compose', '-f', compose_file, 'up', '-d'],
-                capture_output=True, text=True, encoding='utf-8', errors='ignore'
+                [self.compose_bin, '-f', compose_file, 'up', '-d'],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
             )
             
             if start_result.returncode != 0:
-                print(f"Start failed: {start_result.stderr}")
+                print(f"Start failed: {start_result.stderr.decode('utf-8', 'ignore')}")
                 return {}
             
-            # Wait for test duration
-            print(f"Test running for {duration} seconds...")
-            time.sleep(duration)
-            
-            # Capture logs
-            print("Capturing logs...")
-            logs_result = subprocess.run(
-                ['docker-compose', '-f', compose_file, 'logs'],
-                capture_output=True, text=True, encoding='utf-8', errors='ignore'
+            # Follow the logs so they are split out while the test runs, instead of sleeping
+            # for the duration and then dumping them with a separate docker-compose logs
+            process = subprocess.Popen(
+                [self.compose_bin, '-f', compose_file, 'logs', '-f'],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE
             )
+            # The transcript is teed to disk as it arrives rather than held in memory
+            os.makedirs('results', exist_ok=True)
+            error_lines = []
+            client_logs = {}
+            with open(RAW_LOGS_FILE, 'wb') as output:
+                readers = [
+                    threading.Thread(target=self._collect_logs, args=(process.stdout, output, client_logs)),
+                    threading.Thread(target=error_lines.extend, args=(process.stderr,))
+                ]
+                for reader in readers:
+                    reader.start()
+                
+                # Follow until the duration is up; with the restart policy the log stream never ends
+                print(f"Test running for {duration} seconds...")
+                try:
+                    process.wait(timeout=duration)
+                except subprocess.TimeoutExpired:
+                    process.terminate()
+                    process.wait()
+                for reader in readers:
+                    reader.join()
+                process.stdout.close()
+                process.stderr.close()
+            
+            logs = _read_text(RAW_LOGS_FILE)
+            errors = b''.join(error_lines).decode('utf-8', 'ignore')
             
             # Save Docker test results
             docker_results = {
                 'containers': 7,  # server + 5 clients
-                'server_logs': logs_result.stdout,
+                'server_logs': logs,
                 'client_logs': {},
                 'total_packets': 0,
                 'total_bytes': 0,
                 'errors': []
             }
             
-            # Parse logs to extract client logs properly
-            lines = logs_result.stdout.split('\n')
-            client_logs = {}
-            
-            for line in lines:
-                if '|' in line:
-                    # Extract container name and log content
-                    parts = line.split('|', 1)
-                    if len(parts) == 2:
-                        container_name = parts[0].strip()
-                        log_content = parts[1].strip()
-                        
-                        # Only process client containers
-                        if 'client-' in container_name:
-                            if container_name not in client_logs:
-                                client_logs[container_name] = []
-                            client_logs[container_name].append(log_content)
-            
-            # Save client logs
-            for client_name, log_lines in client_logs.items():
-                docker_results['client_logs'][client_name] = '\n'.join(log_lines)
+            # Save client logs: prefer Docker's own per-container log files, which need no
+            # prefix parsing; the split from the streamed output covers unreadable ones
+            docker_results['client_logs'] = self._read_json_logs(compose_file)
+            if not docker_results['client_logs']:
+                for client_name, client_log in client_logs.items():
+                    docker_results['client_logs'][client_name.decode('utf-8', 'ignore')] = (
+                        client_log[:-1].decode('utf-8', 'ignore'))  # Drop the trailing newline
             
             # Save results to file
-            os.makedirs('results', exist_ok=True)
-            with open('results/docker_test_results.json', 'w') as f:
-                json.dump(docker_results, f, indent=2)
+            _write_json(RESULTS_FILE, docker_results)
             
             # Stop services
             print("Stopping services...")
             subprocess.run(
-                ['docker-compose', '-f', compose_file, 'down'],
-                capture_output=True, text=True, encoding='utf-8', errors='ignore'
+                [self.compose_bin, '-f', compose_file, 'down'],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
             )
             
             return {
                 'duration': duration,
-                'logs': logs_result.stdout,
-                'errors': logs_result.stderr,
+                'logs': logs,
+                'errors': errors,
                 'compose_file': compose_file,
                 'docker_results_saved': True
             }
@@ -210,11 +299,71 @@ class OptimizedTestRunner:
             print(f"Docker test error: {e}")
             return {}
     
+    def _read_json_logs(self, compose_file: str) -> Dict[str, str]:
+        """Read client container logs from Docker's json-file logs, or {} if they are unavailable"""
+        try:
+            ps_result = subprocess.run(
+                [self.compose_bin, '-f', compose_file, 'ps', '-q'],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+            )
+            container_ids = ps_result.stdout.split()
+            if ps_result.returncode != 0 or not container_ids:
+                return {}
+            
+            # One inspect call for every container: "<service>-<number> <log path>"
+            inspect_result = subprocess.run(
+                [self.docker_bin, 'inspect', '--format',
+                 '{{index .Config.Labels "com.docker.compose.service"}}-'
+                 '{{index .Config.Labels "com.docker.compose.container-number"}} {{.LogPath}}',
+                 *container_ids],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+            )
+        except OSError:
+            return {}
+        if inspect_result.returncode != 0:
+            return {}
+        
+        loads = orjson.loads if orjson is not None else json.loads
+        client_logs = {}
+        for line in inspect_result.stdout.splitlines():
+            container_name, _, log_path = line.partition(' ')
+            if 'client-' not in container_name:
+                continue
+            try:
+                # One {"log": ..., "stream": ..., "time": ...} object per line
+                with open(log_path, 'rb') as f:
+                    entries = [loads(entry)['log'].strip() for entry in f]
+            except (OSError, ValueError, KeyError):
+                return {}  # Another log driver, or the files are root-only
+            client_logs[container_name] = '\n'.join(entries)
+        return client_logs
+    
+    def _collect_logs(self, stream: BinaryIO, output: BinaryIO, client_logs: Dict[bytes, bytearray]):
+        """Collect streamed compose output, splitting out client container logs as they arrive"""
+        for line in stream:
+            output.write(line)
+            # Extract container name and log content in one scan
+            container_name, separator, log_content = line.partition(b'|')
+            
+            # Only process client containers; one growing buffer each, not a list of lines
+            if separator and b'client-' in container_name:
+                container_name = container_name.strip()
+                client_log = client_logs.get(container_name)
+                if client_log is None:
+                    client_log = client_logs[container_name] = bytearray()
+                client_log += log_content.strip()
+                client_log += b'\n'
+    
     def _stop_monitoring(self):
         """Stop monitoring"""
-        self.monitoring = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=5)
+        if self.monitor_process:
+            self.monitor_process.terminate()
+            try:
+                self.monitor_process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.monitor_process.kill()
+                self.monitor_process.wait()
+            self.monitor_process = None
         print("Monitoring stopped")
     
     def _analyze_results(self) -> Dict[str, Any]:
@@ -222,21 +371,19 @@ class OptimizedTestRunner:
         analysis = {}
         
         try:
-            # Analyze Docker results
-            if os.path.exists('docker_test_results.json'):
-                result = subprocess.run(
-                    ['python', 'analyze_docker_results.py'],
-                    capture_output=True, text=True, encoding='utf-8', errors='ignore'
-                )
-                analysis['docker_analysis'] = result.stdout
-            
-            # Analyze client performance
-            if os.path.exists('docker_test_results.json'):
-                result = subprocess.run(
-                    ['python', 'client_performance_analyzer.py'],
-                    capture_output=True, text=True, encoding='utf-8', errors='ignore'
-                )
-                analysis['client_analysis'] = result.stdout
+            # The analyzers are sibling modules, so they run without an interpreter startup
+            # each. They run one after the other: each fans its clients out over its own
+            # process pool, which must not be nested inside another pool's workers
+            if os.path.exists(RESULTS_FILE):
+                # Imported here: they pull in NumPy, which only the analysis step needs
+                import analyze_docker_results
+                import client_performance_analyzer
+                
+                argv = ['--file', RESULTS_FILE]
+                # Analyze Docker results
+                analysis['docker_analysis'] = _run_captured(analyze_docker_results.main, argv)
+                # Analyze client performance
+                analysis['client_analysis'] = _run_captured(client_performance_analyzer.main, argv)
             
             # Analyze enhanced metrics
             if os.path.exists('enhanced_metrics.json'):
@@ -255,42 +402,41 @@ class OptimizedTestRunner:
             'test_results': test_results,
             'analysis': analysis,
             'timestamp': time.time(),
-            'optimizations_applied': [
-                'Docker network optimization',
-                'System network limits',
-                'Enhanced performance monitoring',
-                'Optimized client simulator',
-                'Resource limits and constraints'
-            ]
+            'optimizations_applied': OPTIMIZATIONS_APPLIED
         }
         
         # Save report
-        with open('results/test_report.json', 'w') as f:
-            json.dump(report, f, indent=2)
+        _write_json('results/test_report.json', report)
         
-        print("\n" + "=" * 80)
-        print("OPTIMIZED TEST REPORT")
-        print("=" * 80)
+        # Collect every line and write once instead of one print call per line
+        out = []
+        out.append("\n" + "=" * 80)
+        out.append("OPTIMIZED TEST REPORT")
+        out.append("=" * 80)
         
-        print(f"\nTest Duration: {test_results.get('duration', 0)} seconds")
-        print(f"Compose File: {test_results.get('compose_file', 'N/A')}")
+        out.append(f"\nTest Duration: {test_results.get('duration', 0)} seconds")
+        out.append(f"Compose File: {test_results.get('compose_file', 'N/A')}")
         
         if 'enhanced_metrics' in analysis:
             metrics = analysis['enhanced_metrics']
-            print(f"\nSystem Performance:")
-            print(f"  Average CPU: {metrics.get('avg_cpu_percent', 0):.1f}%")
-            print(f"  Max CPU: {metrics.get('max_cpu_percent', 0):.1f}%")
-            print(f"  Average Memory: {metrics.get('avg_memory_percent', 0):.1f}%")
-            print(f"  Python Processes: {metrics.get('total_python_processes', 0)}")
+            out.append(f"\nSystem Performance:")
+            out.append(f"  Average CPU: {metrics.get('avg_cpu_percent', 0):.1f}%")
+            out.append(f"  Max CPU: {metrics.get('max_cpu_percent', 0):.1f}%")
+            out.append(f"  Average Memory: {metrics.get('avg_memory_percent', 0):.1f}%")
+            out.append(f"  Python Processes: {metrics.get('total_python_processes', 0)}")
         
-        print(f"\nOptimizations Applied:")
+        out.append(f"\nOptimizations Applied:")
         for opt in report['optimizations_applied']:
-            print(f"  - {opt}")
+            out.append(f"  - {opt}")
         
-        print(f"\nReport saved to: results/test_report.json")
+        out.append(f"\nReport saved to: results/test_report.json")
+        sys.stdout.write('\n'.join(out) + '\n')
+        sys.stdout.flush()
 
 def main():
     """Main function"""
+    import argparse
+    
     parser = argparse.ArgumentParser(description='Optimized Test Runner')
     parser.add_argument('--duration', type=int, default=60, help='Test duration in seconds')
     parser.add_argument('--quick', action='store_true', help='Run quick test (30 seconds)')